@@ -1,28 +1,431 @@
+import re
 import bpy
 import random
+import numpy as np
+from math import radians
+from .fmodifiers import insert_modifier, move_modifier, dedupe_modifiers, match_modifiers
+
+# keyframe properties read and written in bulk, all of them pairs of floats. Enum properties such as the interpolation
+# and handle types can't be accessed in bulk before Blender 4.1, see read_keyframe_types
+KEYFRAME_FIELDS = ("co", "handle_left", "handle_right")
+
+
+def read_keyframes(curve):
+    """Returns the keyframes of the F-Curve as a dict of (count, 2) arrays, one per field of KEYFRAME_FIELDS."""
+    points = curve.keyframe_points
+    keys = {}
+    for name in KEYFRAME_FIELDS:
+        values = np.zeros(len(points) * 2, dtype=np.float32)
+        points.foreach_get(name, values)
+        keys[name] = values.reshape(-1, 2)
+    return keys
+
+
+def read_keyframe_types(curve):
+    """Returns the interpolation and handle types of the keyframes of the F-Curve as a list of (interpolation,
+    handle_left_type, handle_right_type) tuples, read one keyframe at a time."""
+    return [(p.interpolation, p.handle_left_type, p.handle_right_type) for p in curve.keyframe_points]
+
+
+def write_keyframe_types(points, types, start=0):
+    """Sets the interpolation and handle types (see read_keyframe_types) of the keyframe points from index start on."""
+    for index, (interpolation, left, right) in enumerate(types, start):
+        point = points[index]
+        point.interpolation = interpolation
+        point.handle_left_type = left
+        point.handle_right_type = right
+
+
+def write_keyframes(curve, keys, types):
+    """Replaces the keyframes of the F-Curve with the given arrays (see read_keyframes) and interpolation and handle
+    types (see read_keyframe_types). The collection is resized at once, points are only removed one by one on versions
+    of Blender whose keyframe points can't be cleared."""
+    points = curve.keyframe_points
+    count = len(keys["co"])
+
+    if len(points) > count and hasattr(points, "clear"):
+        points.clear()
+    if len(points) < count:
+        points.add(count - len(points))
+    while len(points) > count:
+        points.remove(points[-1], fast=True)
+
+    for name in KEYFRAME_FIELDS:
+        points.foreach_set(name, keys[name].astype(np.float32).ravel())
+    write_keyframe_types(points, types)
+
+    curve.update()
+
+
+def add_keyframes(curve, keys, types):
+    """Adds the given keyframes (see write_keyframes) to the F-Curve, which sorts them in among the existing ones."""
+    points = curve.keyframe_points
+    start = len(points)
+    existing = read_keyframes(curve)
+
+    points.add(len(types))
+    for name in KEYFRAME_FIELDS:
+        points.foreach_set(name, np.concatenate((existing[name], keys[name])).astype(np.float32).ravel())
+    write_keyframe_types(points, types, start)
+
+    curve.update()
+
+
+def bake_fcurve(curve, frames, keep_cycles=True, only_noise=False):
+    """Samples the F-Curve along with its modifiers at the given frames, replaces the keyframes within that range with
+    the samples and removes the modifiers that were baked in: all of them except Cycles if keep_cycles is set, or only
+    the noise modifiers if only_noise is set. The modifiers that stay on the curve are muted while sampling so that
+    they aren't applied twice, which leaves the curve outside of the frames as it was."""
+    modifiers = [m for m in curve.modifiers if not m.mute]
+    if only_noise:
+        baked = [m for m in modifiers if m.type == "NOISE"]
+        muted = [m for m in modifiers if m.type not in {"NOISE", "CYCLES"}]
+    else:
+        baked = [m for m in modifiers if not (keep_cycles and m.type == "CYCLES")]
+        muted = []
+
+    for modifier in muted:
+        modifier.mute = True
+    values = np.array([curve.evaluate(frame) for frame in frames.tolist()], dtype=np.float32)
+    for modifier in muted:
+        modifier.mute = False
+
+    samples = np.stack((frames, values), axis=1).astype(np.float32)
+
+    # the keyframe points within the range are reused for the samples and the keys outside of it are left as they
+    # are, so only the baked keys need their interpolation set
+    points = curve.keyframe_points
+    keys = read_keyframes(curve)
+    inside = np.flatnonzero((keys["co"][:, 0] >= frames[0]) & (keys["co"][:, 0] <= frames[-1]))
+
+    count = len(frames)
+    for index in inside[count:][::-1].tolist():
+        points.remove(points[index], fast=True)
+
+    remaining = np.delete(np.arange(len(keys["co"])), inside[count:])
+    reused = np.flatnonzero(np.isin(remaining, inside[:count]))
+    added = np.arange(len(remaining), len(remaining) + count - len(reused))
+    if len(added):
+        points.add(len(added))
+
+    for name in KEYFRAME_FIELDS:
+        values = np.concatenate((keys[name][remaining], samples[len(reused):]))
+        values[reused] = samples[:len(reused)]
+        points.foreach_set(name, values.ravel())
+
+    for index in np.concatenate((reused, added)).tolist():
+        point = points[index]
+        point.interpolation = "LINEAR"
+        point.handle_left_type = "AUTO_CLAMPED"
+        point.handle_right_type = "AUTO_CLAMPED"
+
+    # sorts the added keys in among the others
+    curve.update()
+
+    for modifier in baked:
+        curve.modifiers.remove(modifier)
+
+
+def get_animation_data_actions(animation_data):
+    """Returns the active action and the actions of all NLA strips of the animation data."""
+    if animation_data is None:
+        return []
+
+    actions = [animation_data.action]
+    for track in animation_data.nla_tracks:
+        actions.extend(strip.action for strip in track.strips)
+    return actions
+
+
+def get_object_actions(obj):
+    """Returns the actions used by the object, its data and its shape keys, including the ones in NLA strips."""
+    actions = get_animation_data_actions(obj.animation_data)
+
+    data = obj.data
+    if data is not None and hasattr(data, "animation_data"):
+        actions += get_animation_data_actions(data.animation_data)
+
+        shape_keys = getattr(data, "shape_keys", None)
+        if shape_keys is not None:
+            actions += get_animation_data_actions(shape_keys.animation_data)
 
+    return actions
+
+
+def compile_data_path_pattern(pattern):
+    """Turns a data path pattern with * and ? wildcards into a regular expression. fnmatch isn't used since data paths
+    are full of brackets, which it would treat as character sets."""
+    return re.compile(re.escape(pattern).replace(r"\*", ".*").replace(r"\?", "."))
+
+
+def gather_fcurves(context, scope="SELECTED", pattern=""):
+    """Returns the editable F-Curves in the given scope whose data path matches the pattern (all of them if it's
+    empty). Each curve is only returned once, even if its action is used in several places."""
+    if scope == "SELECTED":
+        curves = list(context.selected_editable_fcurves or [])
+    else:
+        if scope == "ACTIVE_ACTION":
+            obj = context.object
+            actions = [obj.animation_data.action] if obj is not None and obj.animation_data is not None else []
+        elif scope == "OBJECT_ACTIONS":
+            actions = [action for obj in context.selected_objects for action in get_object_actions(obj)]
+        else:
+            actions = list(bpy.data.actions)
+
+        # dict keys keep the order while dropping the duplicates
+        actions = dict.fromkeys(a for a in actions if a is not None and a.library is None)
+        curves = [c for action in actions for c in action.fcurves]
+
+    if pattern:
+        regex = compile_data_path_pattern(pattern)
+        curves = [c for c in curves if regex.fullmatch(c.data_path)]
+
+    return curves
 
-class RemoveModifiers(bpy.types.Operator):
-    """Removes all F-Curve modifiers from the selected channels."""
+
+class FCurveScopeMixin:
+    scope: bpy.props.EnumProperty(
+        name="Channels",
+        description="Channels the operator is applied to",
+        items=[
+            ("SELECTED", "Selected Channels", "The selected channels of the editor"),
+            ("ACTIVE_ACTION", "Active Action", "Every channel of the action of the active object"),
+            ("OBJECT_ACTIONS", "Selected Objects", "Every channel of every action (including NLA strips) of the selected objects"),
+            ("ALL_ACTIONS", "All Actions", "Every channel of every action in the file"),
+        ],
+        default="SELECTED",
+    )
+
+    data_path_filter: bpy.props.StringProperty(
+        name="Data Path",
+        description="Only affects the channels whose data path matches this pattern (* and ? wildcards), e.g. *location",
+        default="",
+    )
+
+    def gather_fcurves(self, context):
+        return gather_fcurves(context, self.scope, self.data_path_filter)
+
+    def draw_scope(self, layout):
+        layout.prop(self, "scope")
+        layout.prop(self, "data_path_filter")
+
+
+def get_channel_type(curve):
+    """Returns whether the F-Curve animates a location, rotation, scale or some other property."""
+    prop = curve.data_path.rpartition(".")[2]
+    if prop.endswith("location"):
+        return "LOCATION"
+    if prop.startswith("rotation") or prop.startswith("delta_rotation"):
+        return "ROTATION"
+    if prop.endswith("scale"):
+        return "SCALE"
+    return "OTHER"
+
+
+def simplify_keys(x, y, tolerance):
+    """Returns a mask of the keys (x, y) to keep so that interpolating linearly between the kept keys stays within the
+    tolerance of every removed key (Ramer-Douglas-Peucker on the value error). Instead of recursing, every segment
+    between kept keys is split at its worst key at once, until no key is off by more than the tolerance."""
+    count = len(x)
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+    if count < 3:
+        keep[:] = True
+        return keep
+
+    positions = np.arange(count)
+    while True:
+        kept = np.flatnonzero(keep)
+
+        # the kept keys before and after each key
+        segment = np.minimum(np.searchsorted(kept, positions, side="right") - 1, len(kept) - 2)
+        a = kept[segment]
+        b = kept[segment + 1]
+
+        t = (x - x[a]) / (x[b] - x[a])
+        error = np.abs(y - (y[a] + t * (y[b] - y[a])))
+        error[keep] = 0
+
+        worst = np.maximum.reduceat(error, kept[:-1])
+        split = (error > tolerance) & (error == worst[segment])
+        if not split.any():
+            return keep
+
+        # only split each segment once per iteration, at its first worst key
+        _, first = np.unique(segment[split], return_index=True)
+        keep[np.flatnonzero(split)[first]] = True
+
+
+def decimate_fcurve(curve, tolerance):
+    """Removes the keyframes of the F-Curve that can be left out without changing it by more than the tolerance.
+    Returns the number of keyframes before and after.
+
+    The keys to remove are picked with simplify_keys, which measures the error against straight lines. The remaining
+    keys get auto clamped handles that Blender recomputes for their new neighbors, so the curve that's actually produced
+    is evaluated at every removed key and the worst key of each segment that is still off by more than the tolerance is
+    put back, until none is. The curve is only shrunk once, each pass just adds the keys that are put back."""
+    keys = read_keyframes(curve)
+    before = len(keys["co"])
+    if before < 3:
+        return before, before
+
+    x = keys["co"][:, 0].astype(np.float64)
+    y = keys["co"][:, 1].astype(np.float64)
+    keep = simplify_keys(x, y, tolerance)
+    if keep.all():
+        return before, before
+
+    # the remaining keys keep their interpolation but get auto clamped handles
+    types = read_keyframe_types(curve)
+    reduced_types = [(interpolation, "AUTO_CLAMPED", "AUTO_CLAMPED") for interpolation, _, _ in types]
+
+    # only the keyframes are reduced, so the modifiers are left out of the comparison
+    muted = [m for m in curve.modifiers if not m.mute]
+    for modifier in muted:
+        modifier.mute = True
+
+    try:
+        # the keys that are removed are dropped once, after that keys are only ever put back
+        kept = np.flatnonzero(keep)
+        write_keyframes(curve, {name: values[kept] for name, values in keys.items()},
+                        [reduced_types[i] for i in kept.tolist()])
+
+        while True:
+            removed = np.flatnonzero(~keep)
+            evaluated = np.array([curve.evaluate(frame) for frame in x[removed].tolist()], dtype=np.float64)
+            error = np.abs(evaluated - y[removed])
+            off = error > tolerance
+            if not off.any():
+                break
+
+            # put back the worst key of each segment between the kept keys
+            removed, error = removed[off], error[off]
+            segment = np.searchsorted(np.flatnonzero(keep), removed)
+            order = np.lexsort((-error, segment))
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = segment[order[1:]] != segment[order[:-1]]
+
+            restored = np.sort(removed[order[first]])
+            keep[restored] = True
+            add_keyframes(curve, {name: values[restored] for name, values in keys.items()},
+                          [reduced_types[i] for i in restored.tolist()])
+            if keep.all():
+                break
+    finally:
+        for modifier in muted:
+            modifier.mute = False
+
+    # every key had to be put back, so the curve is restored with its original handles
+    if keep.all():
+        write_keyframes(curve, keys, types)
+
+    return before, int(keep.sum())
+
+
+class RemoveModifiers(bpy.types.Operator, FCurveScopeMixin):
+    """Removes the F-Curve modifiers of the selected channels, optionally only those of certain types, frame ranges
+    or influences."""
     bl_idname = "catalyst.bulk_remove_fcurve_modifiers"
     bl_label = "Remove F-Curve Modifiers"
     bl_options = {"REGISTER", "UNDO"}
 
+    types: bpy.props.EnumProperty(
+        name="Types",
+        description="Types of modifiers to remove, removes every type if none are chosen",
+        items=[
+            ("CYCLES", "Cycles", ""),
+            ("NOISE", "Noise", ""),
+            ("GENERATOR", "Generator", ""),
+            ("FNGENERATOR", "Built-In Function", ""),
+            ("ENVELOPE", "Envelope", ""),
+            ("LIMITS", "Limits", ""),
+            ("STEPPED", "Stepped Interpolation", ""),
+        ],
+        options={"ENUM_FLAG"},
+        default=set(),
+    )
+
+    use_frame_range: bpy.props.BoolProperty(
+        name="Only in Frame Range",
+        description="Only removes the modifiers that affect the frame range, modifiers without a restricted range affect every frame",
+        default=False,
+    )
+
+    frame_range: bpy.props.FloatVectorProperty(
+        name="Frame Range (Start, End)",
+        size=2,
+    )
+
+    max_influence: bpy.props.FloatProperty(
+        name="Max Influence",
+        description="Only removes the modifiers with at most this much influence",
+        min=0,
+        max=1,
+        default=1,
+    )
+
     @classmethod
     def poll(cls, context):
         return context.area.type == "GRAPH_EDITOR" or context.area.type == "DOPESHEET_EDITOR"
 
     def execute(self, context):
-        curves = bpy.context.selected_editable_fcurves
+        curves = self.gather_fcurves(context)
+        frame_range = tuple(self.frame_range) if self.use_frame_range else None
+
+        removed = {}
+        channels = 0
 
         for c in curves:
-            for m in c.modifiers:
+            # collect the matches first, removing while iterating the stack would skip modifiers
+            matches = match_modifiers(c, self.types, frame_range, self.max_influence)
+            for m in matches:
+                removed[m.type] = removed.get(m.type, 0) + 1
                 c.modifiers.remove(m)
+            channels += len(matches) > 0
+
+        summary = ", ".join("%d %s" % (count, kind.lower()) for kind, count in sorted(removed.items()))
+        self.report({"INFO"}, "Removed %d modifiers from %d channels%s" % (
+            sum(removed.values()), channels, " (%s)" % summary if summary else ""))
 
         return {"FINISHED"}
 
+    def invoke(self, context, event):
+        self.frame_range = (context.scene.frame_start, context.scene.frame_end)
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+        self.draw_scope(layout)
+
+        layout.separator()
+
+        layout.label(text="Types")
+        layout.prop(self, "types")
+        layout.prop(self, "max_influence")
+        layout.prop(self, "use_frame_range")
 
-class LoopChannels(bpy.types.Operator):
+        if self.use_frame_range:
+            layout.prop(self, "frame_range")
+
+
+def add_cycles_modifier(c):
+    """Makes sure the F-Curve has a Cycles modifier at the top of its modifier stack, where it has to be to loop the
+    keyframes rather than the output of the other modifiers. Adds one or moves the existing one up. Returns whether
+    the stack changed."""
+    types = [m.type for m in c.modifiers]
+    if "CYCLES" not in types:
+        insert_modifier(c, {"type": "CYCLES"}, 0)
+        return True
+
+    index = types.index("CYCLES")
+    if index == 0:
+        return False
+
+    move_modifier(c, index, 0)
+    return True
+
+
+class LoopChannels(bpy.types.Operator, FCurveScopeMixin):
     """Adds a Cycles modifier to the top of stack of multiple selected channels, regardless if there are other modifiers."""
     bl_idname = "catalyst.bulk_add_cycles_modifier"
     bl_label = "Add Cycles Modifier"
@@ -33,35 +436,40 @@ class LoopChannels(bpy.types.Operator):
         return context.area.type == "GRAPH_EDITOR" or context.area.type == "DOPESHEET_EDITOR"
 
     def execute(self, context):
-        curves = bpy.context.selected_editable_fcurves
+        curves = self.gather_fcurves(context)
+        count = sum(add_cycles_modifier(c) for c in curves)
 
-        for c in curves:
-            if "CYCLES" not in [m.type for m in c.modifiers]:
-                if len(c.modifiers) == 0:
-                    c.modifiers.new("CYCLES")
-                else:
-                    mod_data = []
+        self.report({"INFO"}, "Added or moved up the cycles modifier of %d channels" % count)
 
-                    for m in c.modifiers:
-                        keys = dir(m)
-                        mod_data.append({k: getattr(m, k) for k in keys})
-                        c.modifiers.remove(m)
+        return {"FINISHED"}
 
-                    c.modifiers.new("CYCLES")
 
-                    for m in mod_data:
-                        mod = c.modifiers.new(m["type"])
-                        for k in m:
-                            if k != "type":
-                                try:
-                                    setattr(mod, k, m[k])
-                                except:
-                                    pass
+class DedupeModifiers(bpy.types.Operator, FCurveScopeMixin):
+    """Removes the F-Curve modifiers that duplicate an earlier modifier in the same stack."""
+    bl_idname = "catalyst.dedupe_fcurve_modifiers"
+    bl_label = "Remove Duplicate F-Curve Modifiers"
+    bl_options = {"REGISTER", "UNDO"}
+
+    by_type: bpy.props.BoolProperty(
+        name="Any of the Same Type",
+        description="Only keeps the first modifier of each type, instead of only removing modifiers with identical settings",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.area.type == "GRAPH_EDITOR" or context.area.type == "DOPESHEET_EDITOR"
+
+    def execute(self, context):
+        curves = self.gather_fcurves(context)
+        count = sum(dedupe_modifiers(c, self.by_type) for c in curves)
+
+        self.report({"INFO"}, "Removed %d duplicate modifiers from %d channels" % (count, len(curves)))
 
         return {"FINISHED"}
 
 
-class GenerateNoise(bpy.types.Operator):
+class GenerateNoise(bpy.types.Operator, FCurveScopeMixin):
     """Generates random noise using pseudo random number generation and the noise F-Curve Modifier"""
     bl_idname = "catalyst.generate_fcurve_noise"
     bl_label = "Generate Noise"
@@ -176,11 +584,12 @@ class GenerateNoise(bpy.types.Operator):
         return context.area.type == "GRAPH_EDITOR" or context.area.type == "DOPESHEET_EDITOR"
 
     def execute(self, context):
-        curves = bpy.context.selected_editable_fcurves
+        curves = self.gather_fcurves(context)
         rand = random.Random(self.seed)
 
         if self.loop:
-            bpy.ops.catalyst.bulk_add_cycles_modifier()
+            for c in curves:
+                add_cycles_modifier(c)
 
         for c in curves:
             noise: bpy.types.FModifierNoise = c.modifiers.new("NOISE")
@@ -197,8 +606,8 @@ class GenerateNoise(bpy.types.Operator):
             noise.use_restricted_range = self.use_restricted_range
 
             if self.use_restricted_range:
-                if self.auto_frame_range:
-                    frames = bpy.context.object.animation_data.action.frame_range
+                if self.auto_frame_range and isinstance(c.id_data, bpy.types.Action):
+                    frames = c.id_data.frame_range
                     noise.frame_start = frames[0] # bpy.context.scene.frame_start
                     noise.frame_end = frames[1] # bpy.context.scene.frame_end
                 else:
@@ -227,7 +636,7 @@ class GenerateNoise(bpy.types.Operator):
                         noise.blend_in = rand.uniform(0, range)
                         noise.blend_out = range - noise.blend_in
 
-        self.report({"INFO"}, "Added noise modifier to %d selected channels" % (len(curves)))
+        self.report({"INFO"}, "Added noise modifier to %d channels" % (len(curves)))
 
         return {"FINISHED"}
 
@@ -236,6 +645,10 @@ class GenerateNoise(bpy.types.Operator):
 
     def draw(self, context):
         layout = self.layout
+        self.draw_scope(layout)
+
+        layout.separator()
+
         layout.prop(self, "seed")
         layout.prop(self, "loop")
 
@@ -272,7 +685,7 @@ class GenerateNoise(bpy.types.Operator):
         layout.separator()
 
 
-class CopyActiveNoiseToSelectedChannels(bpy.types.Operator):
+class CopyActiveNoiseToSelectedChannels(bpy.types.Operator, FCurveScopeMixin):
     """Copies the settings from the active channel's noise modifiers and adds it as a new modifier to other selected
     channels."""
     bl_idname = "catalyst.copy_active_noise_to_selected"
@@ -308,7 +721,7 @@ class CopyActiveNoiseToSelectedChannels(bpy.types.Operator):
         return "NOISE" in [m.type for m in context.active_editable_fcurve.modifiers]
 
     def execute(self, context):
-        selected_curves = bpy.context.selected_editable_fcurves
+        selected_curves = self.gather_fcurves(context)
         active_curve = bpy.context.active_editable_fcurve
         sources = [m for m in active_curve.modifiers if m.type == "NOISE" and (m.active or not self.only_active_modifier)]
 
@@ -316,9 +729,11 @@ class CopyActiveNoiseToSelectedChannels(bpy.types.Operator):
             self.report({"WARNING"}, "Unable to find active noise modifier")
             return {"CANCELLED"}
 
+        count = 0
         for c in selected_curves:
             if c == active_curve:
                 continue
+            count += 1
 
             for source in sources:
                 clone: bpy.types.FModifierNoise = c.modifiers.new("NOISE")
@@ -335,10 +750,13 @@ class CopyActiveNoiseToSelectedChannels(bpy.types.Operator):
                 clone.use_influence = source.use_influence or self.randomize_influence
                 clone.influence = random.uniform(0, 1) if self.randomize_influence else source.influence
 
+        self.report({"INFO"}, "Copied %d noise modifiers to %d channels" % (len(sources), count))
+
         return {"FINISHED"}
 
     def draw(self, context):
         layout = self.layout
+        self.draw_scope(layout)
 
         active_curve = context.active_editable_fcurve
 
@@ -357,7 +775,7 @@ class CopyActiveNoiseToSelectedChannels(bpy.types.Operator):
         return context.window_manager.invoke_props_dialog(self, width=300)
 
 
-class ImpactJitter(bpy.types.Operator):
+class ImpactJitter(bpy.types.Operator, FCurveScopeMixin):
     """Adds a noise modifier to the chosen channels on all selected bones."""
     bl_idname = "catalyst.add_impact_jitter"
     bl_label = "Add Impact Jitter"
@@ -415,6 +833,7 @@ class ImpactJitter(bpy.types.Operator):
 
     def draw(self, context):
         layout = self.layout
+        self.draw_scope(layout)
         layout.prop(self, "seed")
         layout.prop(self, "strength")
         layout.prop(self, "scale_range")
@@ -433,7 +852,7 @@ class ImpactJitter(bpy.types.Operator):
         return context.window_manager.invoke_props_dialog(self, width=300)
 
     def execute(self, context):
-        curves = bpy.context.selected_editable_fcurves
+        curves = self.gather_fcurves(context)
         rand = random.Random(self.seed)
 
         current_frame = bpy.context.scene.frame_current
@@ -453,11 +872,173 @@ class ImpactJitter(bpy.types.Operator):
             noise.blend_in = self.lead_frames
             noise.blend_out = self.tail_frames
 
-        self.report({"INFO"}, "Added noise modifier to %d selected channels" % (len(curves)))
+        self.report({"INFO"}, "Added noise modifier to %d channels" % (len(curves)))
 
         return {"FINISHED"}
 
 
+class BakeNoise(bpy.types.Operator, FCurveScopeMixin):
+    """Bakes the noise modifiers (and the rest of the modifier stack) of the selected channels into keyframes."""
+    bl_idname = "catalyst.bake_fcurve_noise"
+    bl_label = "Bake Noise to Keyframes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    frame_range_mode: bpy.props.EnumProperty(
+        name="Frame Range",
+        items=[
+            ("ACTION", "Action", "Bake over the frame range of the action each channel belongs to"),
+            ("SCENE", "Scene", "Bake over the frame range of the scene"),
+        ],
+        default="ACTION",
+    )
+
+    step: bpy.props.FloatProperty(
+        name="Step",
+        description="Number of frames between the baked keyframes",
+        min=0.01,
+        default=1,
+    )
+
+    only_noise: bpy.props.BoolProperty(
+        name="Only Noise",
+        description="Only bakes and removes the noise modifiers of the channels that have any, the other modifiers "
+                    "stay in place",
+        default=True,
+    )
+
+    keep_cycles: bpy.props.BoolProperty(
+        name="Keep Cycles Modifiers",
+        description="Keeps the Cycles modifiers so that the baked animation still loops",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.area.type == "GRAPH_EDITOR" or context.area.type == "DOPESHEET_EDITOR"
+
+    def execute(self, context):
+        curves = self.gather_fcurves(context)
+        scene = context.scene
+        baked = 0
+
+        for c in curves:
+            if self.only_noise and "NOISE" not in [m.type for m in c.modifiers]:
+                continue
+
+            # drivers don't belong to an action
+            if self.frame_range_mode == "SCENE" or not isinstance(c.id_data, bpy.types.Action):
+                start, end = scene.frame_start, scene.frame_end
+            else:
+                start, end = c.id_data.frame_range
+
+            frames = np.arange(start, end + self.step * 0.5, self.step, dtype=np.float64)
+            bake_fcurve(c, frames, self.keep_cycles, self.only_noise)
+            baked += 1
+
+        self.report({"INFO"}, "Baked %d channels" % baked)
+
+        return {"FINISHED"}
+
+    def draw(self, context):
+        layout = self.layout
+        self.draw_scope(layout)
+
+        layout.separator()
+
+        layout.prop(self, "frame_range_mode")
+        layout.prop(self, "step")
+        layout.prop(self, "only_noise")
+
+        # Cycles modifiers are only removed when baking the whole stack
+        if not self.only_noise:
+            layout.prop(self, "keep_cycles")
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+
+class DecimateKeyframes(bpy.types.Operator, FCurveScopeMixin):
+    """Removes the keyframes of the selected channels that can be left out without changing the curves by more than a
+    tolerance."""
+    bl_idname = "catalyst.decimate_keyframes"
+    bl_label = "Reduce Keyframes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    location_tolerance: bpy.props.FloatProperty(
+        name="Location",
+        description="Maximum error allowed on location channels",
+        subtype="DISTANCE",
+        min=0,
+        precision=4,
+        default=0.001,
+    )
+
+    rotation_tolerance: bpy.props.FloatProperty(
+        name="Rotation",
+        description="Maximum error allowed on rotation channels",
+        subtype="ANGLE",
+        min=0,
+        precision=3,
+        default=radians(0.1),
+    )
+
+    scale_tolerance: bpy.props.FloatProperty(
+        name="Scale",
+        description="Maximum error allowed on scale channels",
+        min=0,
+        precision=4,
+        default=0.001,
+    )
+
+    other_tolerance: bpy.props.FloatProperty(
+        name="Other",
+        description="Maximum error allowed on all other channels",
+        min=0,
+        precision=4,
+        default=0.001,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.area.type == "GRAPH_EDITOR" or context.area.type == "DOPESHEET_EDITOR"
+
+    def execute(self, context):
+        curves = self.gather_fcurves(context)
+
+        tolerances = {
+            "LOCATION": self.location_tolerance,
+            "ROTATION": self.rotation_tolerance,
+            "SCALE": self.scale_tolerance,
+            "OTHER": self.other_tolerance,
+        }
+
+        total_before = 0
+        total_after = 0
+
+        for c in curves:
+            before, after = decimate_fcurve(c, tolerances[get_channel_type(c)])
+            total_before += before
+            total_after += after
+
+        self.report({"INFO"}, "Reduced %d keyframes to %d on %d channels" % (total_before, total_after, len(curves)))
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+        self.draw_scope(layout)
+
+        layout.label(text="Tolerances")
+        col = layout.column(align=True)
+        col.prop(self, "location_tolerance")
+        col.prop(self, "rotation_tolerance")
+        col.prop(self, "scale_tolerance")
+        col.prop(self, "other_tolerance")
+
+
 def fcurve_tools_submenu(self, context):
     layout: bpy.types.UILayout = self.layout
     layout.separator()
@@ -466,14 +1047,21 @@ def fcurve_tools_submenu(self, context):
     layout.operator(CopyActiveNoiseToSelectedChannels.bl_idname)
     layout.operator(GenerateNoise.bl_idname)
     layout.operator(ImpactJitter.bl_idname)
+    layout.operator(BakeNoise.bl_idname)
+    layout.operator(DecimateKeyframes.bl_idname)
+    layout.operator(DedupeModifiers.bl_idname)
     layout.operator(RemoveModifiers.bl_idname)
 
 
 def register():
     bpy.types.DOPESHEET_MT_context_menu.append(fcurve_tools_submenu)
     bpy.types.DOPESHEET_MT_channel_context_menu.append(fcurve_tools_submenu)
+    bpy.types.GRAPH_MT_context_menu.append(fcurve_tools_submenu)
+    bpy.types.GRAPH_MT_channel_context_menu.append(fcurve_tools_submenu)
 
 
 def unregister():
     bpy.types.DOPESHEET_MT_context_menu.remove(fcurve_tools_submenu)
     bpy.types.DOPESHEET_MT_channel_context_menu.remove(fcurve_tools_submenu)
+    bpy.types.GRAPH_MT_context_menu.remove(fcurve_tools_submenu)
+    bpy.types.GRAPH_MT_channel_context_menu.remove(fcurve_tools_submenu)
@@ -0,0 +1,179 @@
+import bpy
+
+# properties that aren't part of a modifier's settings, "active" is restored for the stack as a whole
+SKIPPED_PROPERTIES = {"rna_type", "type", "active"}
+
+# settings that don't make two modifiers any different when looking for duplicates
+UNCOMPARED_PROPERTIES = {"name", "show_expanded"}
+
+# the valid range of some properties depends on others (the blend range on the frame range, the coefficients on the
+# polynomial order, ...), so those are restored first and the dependent ones last
+FIRST_PROPERTIES = ("mode", "poly_order", "use_restricted_range", "frame_start", "frame_end")
+LAST_PROPERTIES = ("blend_in", "blend_out", "coefficients")
+
+# property identifiers per modifier type, built once from the RNA definition of the type
+schemas = {}
+
+
+def get_schema(modifier):
+    """Returns the identifiers of the settings of the modifier's type in the order they have to be restored in."""
+    schema = schemas.get(modifier.type)
+    if schema is None:
+        identifiers = [
+            prop.identifier for prop in modifier.bl_rna.properties
+            if not prop.is_readonly and prop.type not in {"POINTER", "COLLECTION"}
+            and prop.identifier not in SKIPPED_PROPERTIES
+        ]
+
+        def order(identifier):
+            if identifier in FIRST_PROPERTIES:
+                return FIRST_PROPERTIES.index(identifier)
+            if identifier in LAST_PROPERTIES:
+                return len(FIRST_PROPERTIES) + 1 + LAST_PROPERTIES.index(identifier)
+            return len(FIRST_PROPERTIES)
+
+        schema = schemas[modifier.type] = sorted(identifiers, key=order)
+    return schema
+
+
+def snapshot_modifier(modifier):
+    """Returns the type and settings of the F-Curve modifier, including the control points of envelopes, and whether
+    it's the active modifier."""
+    settings = {}
+    for identifier in get_schema(modifier):
+        value = getattr(modifier, identifier)
+        if hasattr(value, "__len__") and not isinstance(value, (str, set)):
+            value = tuple(value)
+        settings[identifier] = value
+
+    snapshot = {"type": modifier.type, "settings": settings, "active": modifier.active}
+    if modifier.type == "ENVELOPE":
+        snapshot["control_points"] = [(p.frame, p.min, p.max) for p in modifier.control_points]
+    return snapshot
+
+
+def check_position(snapshot, index):
+    """Raises a ValueError if the modifier of the snapshot can't be at the given index of a stack. Blender refuses to
+    add a Cycles modifier to an F-Curve that already has modifiers, so those can only be first."""
+    if snapshot["type"] == "CYCLES" and index > 0:
+        raise ValueError("A Cycles modifier can only be the first modifier of an F-Curve, not at index %d" % index)
+
+
+def restore_modifier(curve, snapshot):
+    """Adds a modifier to the end of the F-Curve's stack from a snapshot (see snapshot_modifier) and returns it."""
+    check_position(snapshot, len(curve.modifiers))
+    modifier = curve.modifiers.new(snapshot["type"])
+    for identifier, value in snapshot["settings"].items():
+        setattr(modifier, identifier, value)
+
+    for frame, low, high in snapshot.get("control_points", ()):
+        point = modifier.control_points.add(frame)
+        point.min = low
+        point.max = high
+
+    return modifier
+
+
+def rebuild_stack(curve, start, snapshots):
+    """Replaces the modifiers of the F-Curve from index start onwards with the given snapshots. Modifiers can only be
+    appended, so only the part of the stack that changes is recreated. The active modifier stays active."""
+    # checked up front so that an invalid order fails before the stack is torn down
+    for index, snapshot in enumerate(snapshots, start):
+        check_position(snapshot, index)
+
+    modifiers = curve.modifiers
+    active = next((m for m in [*modifiers][:start] if m.active), None)
+
+    for modifier in [*modifiers][start:]:
+        modifiers.remove(modifier)
+
+    # every new modifier becomes the active one, so the active one is restored once they've all been added
+    for snapshot in snapshots:
+        modifier = restore_modifier(curve, snapshot)
+        if snapshot.get("active"):
+            active = modifier
+
+    if active is not None:
+        active.active = True
+
+
+def insert_modifier(curve, snapshot, index):
+    """Inserts a modifier into the F-Curve's stack at the given index from a snapshot, a dict with just a "type" adds a
+    modifier with the default settings. Raises a ValueError if that would put a Cycles modifier anywhere but first."""
+    count = len(curve.modifiers)
+    index = max(0, min(index, count))
+
+    if index == count:
+        return restore_modifier(curve, {"settings": {}, **snapshot})
+
+    tail = [snapshot_modifier(m) for m in [*curve.modifiers][index:]]
+    rebuild_stack(curve, index, [{"settings": {}, **snapshot}] + tail)
+    return curve.modifiers[index]
+
+
+def move_modifier(curve, source, target):
+    """Moves the modifier at index source of the F-Curve's stack to index target. Raises a ValueError if that would put
+    a Cycles modifier anywhere but first."""
+    count = len(curve.modifiers)
+    target = max(0, min(target, count - 1))
+    if source == target:
+        return
+
+    start = min(source, target)
+    tail = [snapshot_modifier(m) for m in [*curve.modifiers][start:]]
+    tail.insert(target - start, tail.pop(source - start))
+    rebuild_stack(curve, start, tail)
+
+
+def dedupe_modifiers(curve, by_type=False):
+    """Removes the modifiers that duplicate an earlier modifier of the F-Curve's stack, either any modifier of the same
+    type or only those with identical settings. Returns the number of removed modifiers."""
+    seen = set()
+    duplicates = []
+
+    for modifier in curve.modifiers:
+        if by_type:
+            key = modifier.type
+        else:
+            snapshot = snapshot_modifier(modifier)
+            key = (
+                snapshot["type"],
+                tuple(
+                    (k, tuple(sorted(v)) if isinstance(v, set) else v)
+                    for k, v in snapshot["settings"].items() if k not in UNCOMPARED_PROPERTIES
+                ),
+                tuple(snapshot.get("control_points", ())),
+            )
+
+        if key in seen:
+            duplicates.append(modifier)
+        else:
+            seen.add(key)
+
+    for modifier in duplicates:
+        curve.modifiers.remove(modifier)
+
+    return len(duplicates)
+
+
+def match_modifiers(curve, types=None, frame_range=None, max_influence=1.0):
+    """Returns the modifiers of the F-Curve's stack of the given types (any type if None) whose frame range overlaps
+    the given (start, end) range (any range if None) and whose influence is at most max_influence. Modifiers without a
+    restricted range cover every frame, and those that don't use their influence have an influence of 1."""
+    matches = []
+
+    for modifier in curve.modifiers:
+        if types and modifier.type not in types:
+            continue
+
+        if frame_range is not None and modifier.use_restricted_range:
+            if modifier.frame_end < frame_range[0] or modifier.frame_start > frame_range[1]:
+                continue
+
+        influence = modifier.influence if modifier.use_influence else 1.0
+        if influence > max_influence:
+            continue
+
+        matches.append(modifier)
+
+    return matches
@@ -0,0 +1,42 @@
+import bpy
+from bpy.app.handlers import persistent
+
+# every cache created by mesh_cache, entries are keyed by the pointer of the mesh they were computed for
+mesh_caches = []
+geometry_caches = []
+
+
+def mesh_cache(geometry=True):
+    """Creates a dictionary for caching data per mesh that is dropped whenever a different file is loaded and, unless
+    `geometry` is False, whenever the geometry of the mesh changes."""
+    cache = {}
+    mesh_caches.append(cache)
+    if geometry:
+        geometry_caches.append(cache)
+    return cache
+
+
+@persistent
+def invalidate_mesh_caches(scene, depsgraph):
+    for update in depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, bpy.types.Mesh):
+            key = update.id.original.as_pointer()
+            for cache in geometry_caches:
+                cache.pop(key, None)
+
+
+@persistent
+def clear_mesh_caches(*args):
+    for cache in mesh_caches:
+        cache.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_mesh_caches)
+    bpy.app.handlers.load_post.append(clear_mesh_caches)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_mesh_caches)
+    bpy.app.handlers.load_post.remove(clear_mesh_caches)
+    clear_mesh_caches()
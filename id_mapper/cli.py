@@ -0,0 +1,96 @@
+"""
+Command line entry point for running ID map tasks on a .blend file without opening the UI.
+
+    blender -b asset.blend -P <addon>/id_mapper/cli.py -- bake --resolution 2048 --output //textures
+    blender -b asset.blend -P <addon>/id_mapper/cli.py -- export --triangles --output //export
+
+Run with --help after the "--" separator for the full list of options.
+"""
+
+import os
+import sys
+import argparse
+import importlib
+
+ADDON_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_PACKAGE = os.path.basename(ADDON_DIRECTORY)
+
+
+def load_addon():
+    """Enables the addon (even if it isn't installed) so that the ID map data is registered on meshes."""
+    import addon_utils
+
+    parent = os.path.dirname(ADDON_DIRECTORY)
+    if parent not in sys.path:
+        sys.path.append(parent)
+
+    addon_utils.enable(ADDON_PACKAGE, default_set=False)
+    return importlib.import_module(ADDON_PACKAGE + ".id_mapper")
+
+
+def get_objects(bpy, names):
+    """Returns the mesh objects with the given names or every mesh object that has ID groups."""
+    if names:
+        return [bpy.data.objects[name] for name in names]
+    return [o for o in bpy.data.objects if o.type == "MESH" and len(o.data.id_map.groups) > 0]
+
+
+def bake(bpy, args):
+    op_bake = importlib.import_module(ADDON_PACKAGE + ".id_mapper.op_bake")
+    raster = importlib.import_module(ADDON_PACKAGE + ".id_mapper.raster")
+    directory = bpy.path.abspath(args.output)
+    os.makedirs(directory, exist_ok=True)
+
+    for obj in get_objects(bpy, args.objects):
+        filepath = os.path.join(directory, bpy.path.clean_name(obj.name) + "_ID.png")
+        op_bake.bake_id_map(
+            obj,
+            args.resolution,
+            args.resolution,
+            uv_layer=args.uv_layer,
+            padding=args.padding,
+            threads=args.threads or raster.default_threads(),
+            filepath=filepath,
+        )
+        print("Baked %s -> %s" % (obj.name, filepath))
+
+
+def export(bpy, args):
+    op_export = importlib.import_module(ADDON_PACKAGE + ".id_mapper.op_export")
+    directory = bpy.path.abspath(args.output)
+    os.makedirs(directory, exist_ok=True)
+
+    for obj in get_objects(bpy, args.objects):
+        filepath = os.path.join(directory, bpy.path.clean_name(obj.name) + ".idmap")
+        op_export.export_id_data(obj, filepath, args.triangles)
+        print("Exported %s -> %s" % (obj.name, filepath))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="blender -b <file> -P cli.py --", description="Catalyst Tools ID map tasks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_bake = commands.add_parser("bake", help="Bake an ID map texture for each mesh")
+    parser_bake.add_argument("--objects", nargs="*", help="Names of the objects to bake (default: all with ID groups)")
+    parser_bake.add_argument("--resolution", type=int, default=2048, help="Width and height of the baked images")
+    parser_bake.add_argument("--padding", type=int, default=4, help="Number of pixels to extend the colors by")
+    parser_bake.add_argument("--threads", type=int, default=0, help="Number of rasterizer threads (0 for auto)")
+    parser_bake.add_argument("--uv-layer", default=None, help="Name of the UV map to use (default: active)")
+    parser_bake.add_argument("--output", default="//", help="Directory to write the images to")
+    parser_bake.set_defaults(func=bake)
+
+    parser_export = commands.add_parser("export", help="Export the ID data of each mesh to a binary .idmap file")
+    parser_export.add_argument("--objects", nargs="*", help="Names of the objects to export (default: all with ID groups)")
+    parser_export.add_argument("--triangles", action="store_true", help="Include the triangulated group indices")
+    parser_export.add_argument("--output", default="//", help="Directory to write the files to")
+    parser_export.set_defaults(func=export)
+
+    args = parser.parse_args(argv)
+
+    import bpy
+    load_addon()
+    args.func(bpy, args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
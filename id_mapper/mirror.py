@@ -0,0 +1,133 @@
+import re
+import numpy as np
+from .caches import mesh_cache
+from .topology import get_topology_signature
+
+# face mirror maps per mesh, validated against the topology and vertex positions of the mesh
+mirror_maps = mesh_cache(geometry=False)
+
+# offsets of the 27 grid cells around (and including) a cell
+NEIGHBOR_CELLS = np.stack(np.meshgrid((-1, 0, 1), (-1, 0, 1), (-1, 0, 1), indexing="ij"), axis=-1).reshape(-1, 3)
+
+SIDE_PATTERN = re.compile(r"(^|[._\- ])(L|R|l|r|Left|Right|left|right|LEFT|RIGHT)($|[._\- ])")
+SIDE_FLIPS = {
+    "L": "R", "R": "L", "l": "r", "r": "l",
+    "Left": "Right", "Right": "Left", "left": "right", "right": "left", "LEFT": "RIGHT", "RIGHT": "LEFT",
+}
+
+
+def get_face_centers(mesh):
+    centers = np.zeros(len(mesh.polygons) * 3, dtype=np.float64)
+    mesh.polygons.foreach_get("center", centers)
+    return centers.reshape(-1, 3)
+
+
+def build_mirror_map(centers, axis, tolerance):
+    """Returns the index of the face whose center is the mirror image of each face center across the given axis (within
+    the tolerance), or -1 if there is none.
+
+    Centers are hashed into a grid with cells the size of the tolerance, so each mirrored center only has to be looked
+    up in the 27 cells around it. Every center in those cells is considered and the nearest one within the tolerance
+    wins, so cells holding several centers (faces smaller than the tolerance) still find their partners."""
+    if len(centers) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    cell = max(tolerance, 1e-6)
+    mirrored = centers.copy()
+    mirrored[:, axis] *= -1
+
+    keys = np.floor(centers / cell).astype(np.int64)
+    mirrored_keys = np.floor(mirrored / cell).astype(np.int64)
+
+    # pack the 3D cell coordinates into a single integer per cell
+    lower = np.minimum(keys.min(axis=0), mirrored_keys.min(axis=0)) - 1
+    extent = np.maximum(keys.max(axis=0), mirrored_keys.max(axis=0)) + 2 - lower
+
+    def pack(k):
+        k = k - lower
+        return (k[:, 0] * extent[1] + k[:, 1]) * extent[2] + k[:, 2]
+
+    packed = pack(keys)
+    order = np.argsort(packed, kind="stable")
+    packed = packed[order]
+
+    queries = []
+    candidates = []
+
+    for offset in NEIGHBOR_CELLS:
+        # every center in the cell is a candidate, the sorted keys of a cell span [left, right)
+        query = pack(mirrored_keys + offset)
+        left = np.searchsorted(packed, query, "left")
+        counts = np.searchsorted(packed, query, "right") - left
+
+        index = np.repeat(np.arange(len(centers)), counts)
+        local = np.arange(len(index)) - np.repeat(np.cumsum(counts) - counts, counts)
+        queries.append(index)
+        candidates.append(order[left[index] + local])
+
+    queries = np.concatenate(queries)
+    candidates = np.concatenate(candidates)
+    distance = np.linalg.norm(centers[candidates] - mirrored[queries], axis=1)
+
+    close = distance <= tolerance
+    queries, candidates, distance = queries[close], candidates[close], distance[close]
+
+    # keep the nearest candidate of each center
+    nearest = np.lexsort((distance, queries))
+    first = np.ones(len(nearest), dtype=bool)
+    first[1:] = queries[nearest[1:]] != queries[nearest[:-1]]
+    nearest = nearest[first]
+
+    result = np.full(len(centers), -1, dtype=np.int64)
+    result[queries[nearest]] = candidates[nearest]
+    return result
+
+
+def get_mirror_map(mesh, axis, tolerance):
+    """Returns the cached mirror map of the mesh's faces (see build_mirror_map), rebuilding it when the topology or the
+    vertex positions of the mesh changed."""
+    coords = np.zeros(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    signature = (get_topology_signature(mesh), hash(coords.tobytes()))
+
+    key = mesh.as_pointer()
+    entry = mirror_maps.get(key)
+    if entry is None or entry[0] != signature:
+        entry = mirror_maps[key] = (signature, {})
+
+    maps = entry[1]
+    if (axis, tolerance) not in maps:
+        maps[(axis, tolerance)] = build_mirror_map(get_face_centers(mesh), axis, tolerance)
+    return maps[(axis, tolerance)]
+
+
+def flip_side_name(name):
+    """Returns the name with its side (.L/.R, _Left/_Right, ...) flipped, or None if the name has no side."""
+    matches = list(SIDE_PATTERN.finditer(name))
+    if len(matches) == 0:
+        return None
+
+    match = matches[-1]
+    return name[:match.start(2)] + SIDE_FLIPS[match.group(2)] + name[match.end(2):]
+
+
+class FaceMirror:
+    """Options for mirroring an ID assignment onto the other half of a symmetric mesh, across an object space axis."""
+
+    def __init__(self, axis="X", tolerance=0.001, use_names=True):
+        self.axis = "XYZ".index(axis)
+        self.tolerance = tolerance
+        self.use_names = use_names
+
+    def get_mirrored_faces(self, mesh, face_mask):
+        """Returns a mask of the faces mirroring the masked faces."""
+        partners = get_mirror_map(mesh, self.axis, self.tolerance)[face_mask]
+        mirrored = np.zeros(len(face_mask), dtype=bool)
+        mirrored[partners[partners >= 0]] = True
+        return mirrored
+
+    def get_group_name(self, name):
+        """Returns the name of the group the mirrored faces are assigned to."""
+        if self.use_names:
+            return flip_side_name(name) or name
+        return name
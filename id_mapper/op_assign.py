@@ -1,16 +1,74 @@
 import bpy
-from .utils import paint_selected_faces, get_selected_faces
+from .mirror import FaceMirror
+from .utils import assign_selected_faces, has_selected_faces
 from .types import ID_UL_IDGroupsList
 
 
+# enum items per ID map keyed by the pointer of the ID map. Blender doesn't copy the strings of dynamic enum items, so
+# they have to stay referenced for as long as they can be displayed
+group_enum_items = {}
+
+
 def get_groups_enum(self, context):
-    output = []
-    for name in context.object.data.id_map.get_group_names():
-        output.append((name, name, "", ""))
-    return output
+    """Returns the groups of the active mesh as enum items, only rebuilding them when the groups changed."""
+    obj = context.object
+    if obj == None or obj.type != "MESH":
+        return []
+
+    id_map = obj.data.id_map
+    key = id_map.as_pointer()
+    signature = (id_map.revision, len(id_map.groups))
+
+    entry = group_enum_items.get(key)
+    if entry is None or entry[0] != signature:
+        items = [(name, name, "", index) for index, name in enumerate(id_map.get_group_names())]
+        entry = group_enum_items[key] = (signature, items)
+    return entry[1]
+
+
+class MirrorAssignMixin:
+    mirror_axis: bpy.props.EnumProperty(
+        name="Mirror",
+        description="Also assign the faces mirroring the selection across an object space axis",
+        items=[
+            ("NONE", "None", "Don't mirror the assignment"),
+            ("X", "X", "Mirror across the X axis"),
+            ("Y", "Y", "Mirror across the Y axis"),
+            ("Z", "Z", "Mirror across the Z axis"),
+        ],
+        default="NONE",
+    )
+
+    mirror_tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Maximum distance between the mirrored face centers",
+        subtype="DISTANCE",
+        min=0,
+        precision=4,
+        default=0.001,
+    )
+
+    use_mirror_names: bpy.props.BoolProperty(
+        name="Use Side Names",
+        description="Assign the mirrored faces to the group with the opposite side in its name (.L/.R, _Left/_Right)",
+        default=True,
+    )
+
+    def get_mirror(self):
+        if self.mirror_axis == "NONE":
+            return None
+        return FaceMirror(self.mirror_axis, self.mirror_tolerance, self.use_mirror_names)
+
+    def draw_mirror(self, layout):
+        row = layout.row()
+        row.prop(self, "mirror_axis", expand=True)
 
+        if self.mirror_axis != "NONE":
+            layout.prop(self, "mirror_tolerance")
+            layout.prop(self, "use_mirror_names")
 
-class ID_AssignGroup(bpy.types.Operator):
+
+class ID_AssignGroup(bpy.types.Operator, MirrorAssignMixin):
     """Assigns an ID group to the selected faces by group name"""
     bl_label = "Assign ID Group by Name"
     bl_idname = "idmap.assign_id_group"
@@ -23,24 +81,23 @@ class ID_AssignGroup(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        faces = get_selected_faces(context)
-        has_group = context.object.data.id_map.active != None
-        return context.mode == "EDIT_MESH" and len(faces) > 0 and has_group
+        obj = context.object
+        if obj == None or obj.type != "MESH" or obj.data.id_map.active == None:
+            return False
+        return has_selected_faces(context)
 
     def execute(self, context):
         mesh = context.object.data
 
-        # get the group that we want to assign the color for
+        # get the group that we want to assign the faces to
         group = mesh.id_map.get_group_by_name(self.group_name)
-        if (group == None):
+        if group == None:
             # self.report({"ERROR"}, "Failed to find group with name: %s" %
             #             self.group_name)
             return {"CANCELLED"}
 
-        # paint the group with the color for the faces
-        paint_selected_faces(context, group.color)
-
-        bpy.ops.object.mode_set(mode="EDIT")
+        # assign the group to the faces of every mesh being edited
+        assign_selected_faces(context, group.name, group.color, self.get_mirror())
 
         return {"FINISHED"}
 
@@ -52,9 +109,48 @@ class ID_AssignGroup(bpy.types.Operator):
         layout = self.layout
         layout.template_list(ID_UL_IDGroupsList.__name__,
                              "", id_map, "groups", id_map, "active_index")
+        self.draw_mirror(layout)
+
 
+class ID_SearchAssignGroup(bpy.types.Operator, MirrorAssignMixin):
+    """Searches the ID groups by name and assigns the chosen one to the selected faces"""
+    bl_label = "Assign ID Group"
+    bl_idname = "idmap.search_assign_id_group"
+    bl_options = {"REGISTER", "UNDO"}
+    bl_property = "group"
+
+    group: bpy.props.EnumProperty(
+        name="Group",
+        description="ID group to assign",
+        items=get_groups_enum,
+    )
 
-class ID_AssignActiveGroup(bpy.types.Operator):
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        if obj == None or obj.type != "MESH" or obj.data.id_map.active == None:
+            return False
+        return has_selected_faces(context)
+
+    def execute(self, context):
+        group = context.object.data.id_map.get_group_by_name(self.group)
+        if group == None:
+            return {"CANCELLED"}
+
+        assign_selected_faces(context, group.name, group.color, self.get_mirror())
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        context.window_manager.invoke_search_popup(self)
+        return {"RUNNING_MODAL"}
+
+    def draw(self, context):
+        self.layout.prop(self, "group")
+        self.draw_mirror(self.layout)
+
+
+class ID_AssignActiveGroup(bpy.types.Operator, MirrorAssignMixin):
     """Assigns the selected/active ID group index to the selected faces"""
     bl_label = "Assign ID Group"
     bl_idname = "idmap.assign_active_id_group"
@@ -62,22 +158,21 @@ class ID_AssignActiveGroup(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        faces = get_selected_faces(context)
-        has_group = context.object.data.id_map.active != None
-        return context.mode == "EDIT_MESH" and len(faces) > 0 and has_group
+        obj = context.object
+        if obj == None or obj.type != "MESH" or obj.data.id_map.active == None:
+            return False
+        return has_selected_faces(context)
 
     def execute(self, context):
         mesh = context.object.data
 
-        # get the group that we want to assign the color for
+        # get the group that we want to assign the faces to
         group = mesh.id_map.active
         if group == None:
             group = mesh.id_map.find_or_create_group("Default")
 
-        # paint the group with the color for the faces
-        paint_selected_faces(context, group.color)
-
-        bpy.ops.object.mode_set(mode="EDIT")
+        # assign the group to the faces of every mesh being edited
+        assign_selected_faces(context, group.name, group.color, self.get_mirror())
 
         return {"FINISHED"}
 
@@ -89,3 +184,4 @@ class ID_AssignActiveGroup(bpy.types.Operator):
         layout = self.layout
         layout.template_list(ID_UL_IDGroupsList.__name__,
                              "", id_map, "groups", id_map, "active_index")
+        self.draw_mirror(layout)
@@ -0,0 +1,133 @@
+import os
+import bpy
+import numpy as np
+from .raster import rasterize, default_threads
+from .utils import get_mesh_objects, prepare_id_mesh, read_face_ids, get_palette, sync_to_editmode
+
+
+def bake_id_map(obj, width, height, image_name=None, uv_layer=None, padding=4, threads=0, tile_size=256, filepath=None):
+    """Rasterizes the ID group colors of the object's faces into an image using the UV layout and returns the image.
+    The image is saved as a PNG when a filepath is given."""
+    mesh = obj.data
+
+    uvs = mesh.uv_layers.get(uv_layer) if uv_layer else mesh.uv_layers.active
+    if uvs is None:
+        raise ValueError("Mesh '%s' has no UV map to bake the ID map with" % mesh.name)
+
+    prepare_id_mesh(obj)
+    ids = read_face_ids(mesh)
+    palette = get_palette(mesh)
+    sync_to_editmode(obj)
+
+    mesh.calc_loop_triangles()
+    tri_loops = np.zeros(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    tri_faces = np.zeros(len(mesh.loop_triangles), dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    mesh.loop_triangles.foreach_get("polygon_index", tri_faces)
+
+    loop_uvs = np.zeros(len(mesh.loops) * 2, dtype=np.float32)
+    uvs.data.foreach_get("uv", loop_uvs)
+
+    triangles = loop_uvs.reshape(-1, 2)[tri_loops].reshape(-1, 3, 2) * (width, height)
+    colors = palette[np.where(ids < len(palette) - 1, ids, -1)][tri_faces]
+
+    pixels = rasterize(triangles, colors, width, height, tile_size, threads, padding)
+
+    image_name = image_name or "%s_ID" % obj.name
+    image = bpy.data.images.get(image_name)
+    if image is None:
+        image = bpy.data.images.new(image_name, width, height, alpha=True)
+    elif tuple(image.size) != (width, height):
+        image.scale(width, height)
+
+    image.pixels.foreach_set(pixels.ravel())
+    image.update()
+
+    if filepath:
+        image.filepath_raw = filepath
+        image.file_format = "PNG"
+        image.save()
+
+    return image
+
+
+class ID_BakeIDMap(bpy.types.Operator):
+    """Bakes the ID groups of the selected meshes into an image per mesh using their UV layout"""
+    bl_label = "Bake ID Map Texture"
+    bl_idname = "idmap.bake_id_map"
+    bl_options = {"REGISTER", "UNDO"}
+
+    resolution: bpy.props.IntVectorProperty(
+        name="Resolution",
+        description="Width and height of the baked image",
+        size=2,
+        min=1,
+        default=(2048, 2048),
+    )
+
+    padding: bpy.props.IntProperty(
+        name="Padding",
+        description="Number of pixels the ID colors are extended by past the UV island borders",
+        min=0,
+        default=4,
+    )
+
+    threads: bpy.props.IntProperty(
+        name="Threads",
+        description="Number of threads used to rasterize the image, 0 picks one based on the number of CPUs",
+        min=0,
+        default=0,
+    )
+
+    save: bpy.props.BoolProperty(
+        name="Save Images",
+        description="Saves the baked images as PNG files to the output directory",
+        default=False,
+    )
+
+    directory: bpy.props.StringProperty(
+        name="Output Directory",
+        description="Directory the baked images are saved to",
+        subtype="DIR_PATH",
+        default="//",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode in {"OBJECT", "EDIT_MESH"} and context.object != None and context.object.type == "MESH"
+
+    def execute(self, context):
+        width, height = self.resolution
+        threads = self.threads or default_threads()
+        count = 0
+
+        for obj in get_mesh_objects(context):
+            if len(obj.data.id_map.groups) == 0:
+                continue
+
+            filepath = None
+            if self.save:
+                filepath = os.path.join(bpy.path.abspath(self.directory), bpy.path.clean_name(obj.name) + "_ID.png")
+
+            try:
+                bake_id_map(obj, width, height, padding=self.padding, threads=threads, filepath=filepath)
+                count += 1
+            except ValueError as e:
+                self.report({"WARNING"}, str(e))
+
+        self.report({"INFO"}, "Baked ID maps for %d meshes" % count)
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "resolution")
+        layout.prop(self, "padding")
+        layout.prop(self, "threads")
+        layout.prop(self, "save")
+
+        if self.save:
+            layout.prop(self, "directory")
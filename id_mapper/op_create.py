@@ -1,5 +1,5 @@
 import bpy
-from .utils import paint_selected_faces
+from .utils import assign_selected_faces
 
 
 class ID_CreateGroup(bpy.types.Operator):
@@ -31,8 +31,8 @@ class ID_CreateGroup(bpy.types.Operator):
 
         # assign the group to the selected faces
         if self.assign_selected and context.mode == "EDIT_MESH":
-            # paint the group with the color for the faces
-            paint_selected_faces(context, group.color)
+            # assign the group to the faces of every mesh being edited
+            assign_selected_faces(context, group.name, group.color)
 
         return {"FINISHED"}
 
@@ -0,0 +1,157 @@
+"""
+Exports the ID groups of meshes to a compact binary sidecar file (.idmap) for import into game engines.
+
+All values are little-endian, arrays start on a 4 byte boundary.
+
+    header          magic "CIDM", version (u16), flags (u16), group count (u32), face count (u32), triangle count (u32)
+    groups          per group: name length (u16), name (utf-8), color (4 x f32)
+    face ids        group index per face (u8, or u16 if the WIDE_IDS flag is set), the max value marks unassigned faces
+    triangles       only with the TRIANGLES flag: group index per triangle (same type as face ids) followed by the
+                    vertex indices of each triangle (3 x u32)
+"""
+
+import os
+import bpy
+import struct
+import numpy as np
+from .utils import get_mesh_objects, prepare_id_mesh, read_face_ids, get_palette, sync_to_editmode
+
+MAGIC = b"CIDM"
+VERSION = 1
+
+FLAG_TRIANGLES = 1 << 0
+FLAG_WIDE_IDS = 1 << 1
+
+HEADER = struct.Struct("<4sHHIII")
+
+
+def align(f):
+    """Pads the file with zeros up to the next 4 byte boundary."""
+    f.write(b"\0" * (-f.tell() % 4))
+
+
+def export_id_data(obj, filepath, triangles=False):
+    """Writes the ID groups and the group index of each face (and optionally each triangle) of the object's mesh."""
+    mesh = obj.data
+    groups = mesh.id_map.groups
+
+    prepare_id_mesh(obj)
+    ids = read_face_ids(mesh)
+    palette = get_palette(mesh)[:-1]
+    sync_to_editmode(obj)
+
+    flags = 0
+    dtype = np.dtype("<u1")
+    if len(groups) >= 0xFF:
+        flags |= FLAG_WIDE_IDS
+        dtype = np.dtype("<u2")
+
+    unassigned = np.iinfo(dtype).max
+    packed = np.where((ids >= 0) & (ids < len(groups)), ids, unassigned).astype(dtype)
+
+    tri_count = 0
+    if triangles:
+        flags |= FLAG_TRIANGLES
+        mesh.calc_loop_triangles()
+        tri_count = len(mesh.loop_triangles)
+        tri_faces = np.zeros(tri_count, dtype=np.int32)
+        tri_verts = np.zeros(tri_count * 3, dtype="<u4")
+        mesh.loop_triangles.foreach_get("polygon_index", tri_faces)
+        mesh.loop_triangles.foreach_get("vertices", tri_verts)
+
+    with open(filepath, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(groups), len(ids), tri_count))
+
+        for group, color in zip(groups, palette):
+            name = group.name.encode("utf-8")
+            f.write(struct.pack("<H", len(name)))
+            f.write(name)
+            f.write(struct.pack("<4f", *color))
+
+        align(f)
+        packed.tofile(f)
+
+        if triangles:
+            align(f)
+            packed[tri_faces].tofile(f)
+            align(f)
+            tri_verts.tofile(f)
+
+
+def read_id_data(filepath):
+    """Reads a file written by export_id_data and returns a dictionary with the groups and the index arrays."""
+    data = np.fromfile(filepath, dtype=np.uint8)
+    magic, version, flags, group_count, face_count, tri_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version > VERSION:
+        raise ValueError("Unsupported ID data file: %s" % filepath)
+
+    offset = HEADER.size
+    groups = []
+    for _ in range(group_count):
+        (length,) = struct.unpack_from("<H", data, offset)
+        name = bytes(data[offset + 2:offset + 2 + length]).decode("utf-8")
+        color = struct.unpack_from("<4f", data, offset + 2 + length)
+        groups.append((name, color))
+        offset += 2 + length + 16
+
+    dtype = np.dtype("<u2" if flags & FLAG_WIDE_IDS else "<u1")
+
+    def read_array(dtype, count):
+        nonlocal offset
+        offset += -offset % 4
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    output = {"groups": groups, "face_ids": read_array(dtype, face_count)}
+
+    if flags & FLAG_TRIANGLES:
+        output["triangle_ids"] = read_array(dtype, tri_count)
+        output["triangles"] = read_array(np.dtype("<u4"), tri_count * 3).reshape(-1, 3)
+
+    return output
+
+
+class ID_ExportIDData(bpy.types.Operator):
+    """Exports the ID groups of the selected meshes to a binary .idmap file per mesh for use in game engines"""
+    bl_label = "Export ID Data"
+    bl_idname = "idmap.export_id_data"
+    bl_options = {"REGISTER"}
+
+    directory: bpy.props.StringProperty(
+        name="Output Directory",
+        description="Directory the .idmap files are written to",
+        subtype="DIR_PATH",
+    )
+
+    filter_folder: bpy.props.BoolProperty(default=True, options={"HIDDEN"})
+
+    triangles: bpy.props.BoolProperty(
+        name="Include Triangles",
+        description="Also write the group index and vertex indices of each triangle of the triangulated mesh",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode in {"OBJECT", "EDIT_MESH"} and context.object != None and context.object.type == "MESH"
+
+    def execute(self, context):
+        directory = bpy.path.abspath(self.directory)
+        count = 0
+
+        for obj in get_mesh_objects(context):
+            if len(obj.data.id_map.groups) == 0:
+                continue
+
+            filepath = os.path.join(directory, bpy.path.clean_name(obj.name) + ".idmap")
+            export_id_data(obj, filepath, self.triangles)
+            count += 1
+
+        self.report({"INFO"}, "Exported ID data for %d meshes" % count)
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
@@ -0,0 +1,114 @@
+import bpy
+import numpy as np
+from math import radians
+from .topology import get_face_adjacency
+from .utils import get_mesh_objects, has_selected_faces, prepare_id_mesh, read_face_ids, write_face_ids, get_face_selection, sync_to_editmode
+
+delimiters = [
+    ("SEAM", "Seams", "Stop at seams"),
+    ("SHARP", "Sharp Edges", "Stop at sharp edges"),
+    ("MATERIAL", "Materials", "Stop where the material changes"),
+    ("ID", "ID Groups", "Stop where the ID group changes"),
+    ("NORMAL", "Face Angle", "Stop at edges whose faces differ by more than the angle"),
+]
+
+
+def flood_fill(mesh, seeds, delimit, angle=0.0):
+    """Returns a face mask of every face reachable from the seed faces without crossing any of the delimiters. The
+    region is grown one ring of neighbors at a time across all faces of the current ring at once."""
+    adjacency = get_face_adjacency(mesh)
+
+    blocked_edges = np.zeros(len(mesh.edges), dtype=bool)
+    for flag, prop in (("SEAM", "use_seam"), ("SHARP", "use_edge_sharp")):
+        if flag in delimit:
+            values = np.zeros(len(mesh.edges), dtype=bool)
+            mesh.edges.foreach_get(prop, values)
+            blocked_edges |= values
+
+    # per face values that must match between neighbors
+    keys = []
+    if "MATERIAL" in delimit:
+        materials = np.zeros(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", materials)
+        keys.append(materials)
+    if "ID" in delimit:
+        keys.append(read_face_ids(mesh))
+
+    normals = None
+    if "NORMAL" in delimit:
+        normals = np.zeros(len(mesh.polygons) * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("normal", normals)
+        normals = normals.reshape(-1, 3)
+
+    # hidden faces can neither be filled nor be filled through
+    hidden = np.zeros(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("hide", hidden)
+    visited = hidden | seeds
+    frontier = np.flatnonzero(seeds)
+
+    while len(frontier) > 0:
+        faces, neighbors, edges = adjacency.expand(frontier)
+        passable = ~visited[neighbors] & ~blocked_edges[edges]
+
+        for key in keys:
+            passable &= key[faces] == key[neighbors]
+        if normals is not None:
+            passable &= (normals[faces] * normals[neighbors]).sum(axis=1) >= np.cos(angle)
+
+        frontier = np.unique(neighbors[passable])
+        visited[frontier] = True
+
+    return visited & ~hidden
+
+
+class ID_FloodFillGroup(bpy.types.Operator):
+    """Assigns the active ID group to every face connected to the selected faces, stopping at the chosen borders"""
+    bl_label = "Fill Connected with ID Group"
+    bl_idname = "idmap.flood_fill_id_group"
+    bl_options = {"REGISTER", "UNDO"}
+
+    delimit: bpy.props.EnumProperty(
+        name="Delimit",
+        description="Borders the fill doesn't cross",
+        items=delimiters,
+        options={"ENUM_FLAG"},
+        default={"SEAM", "ID"},
+    )
+
+    angle: bpy.props.FloatProperty(
+        name="Angle",
+        description="Maximum angle between neighboring faces when delimiting by face angle",
+        subtype="ANGLE",
+        min=0,
+        max=radians(180),
+        default=radians(30),
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        if obj == None or obj.type != "MESH" or obj.data.id_map.active == None:
+            return False
+        return has_selected_faces(context)
+
+    def execute(self, context):
+        group = context.object.data.id_map.active
+
+        for obj in get_mesh_objects(context):
+            mesh = obj.data
+
+            if mesh.total_face_sel == 0:
+                continue
+
+            id_map = mesh.id_map
+            index = id_map.get_group_index(id_map.find_or_create_group(group.name, group.color).name)
+
+            prepare_id_mesh(obj)
+
+            ids = read_face_ids(mesh)
+            ids[flood_fill(mesh, get_face_selection(mesh), self.delimit, self.angle)] = index
+            write_face_ids(mesh, ids)
+
+            sync_to_editmode(obj)
+
+        return {"FINISHED"}
@@ -0,0 +1,166 @@
+import bpy
+import numpy as np
+from math import radians
+from .topology import get_face_islands, compact_labels
+from .utils import get_mesh_objects, prepare_id_mesh, read_face_ids, write_face_ids, get_face_selection, sync_to_editmode
+
+sources = [
+    ("MATERIAL", "Material Slots", "One group per material slot"),
+    ("MESH_ISLAND", "Mesh Islands", "One group per set of connected faces"),
+    ("UV_ISLAND", "UV Islands", "One group per UV island"),
+    ("SEAM", "Seams", "One group per region bounded by seams"),
+    ("SHARP", "Sharp Edges", "One group per region bounded by sharp edges"),
+    ("NORMAL", "Face Angle", "One group per region of connected faces that face roughly the same direction"),
+]
+
+delimiters = {
+    "MESH_ISLAND": (),
+    "UV_ISLAND": ("UV",),
+    "SEAM": ("SEAM",),
+    "SHARP": ("SHARP",),
+    "NORMAL": ("NORMAL",),
+}
+
+
+class ID_GenerateGroups(bpy.types.Operator):
+    """Partitions the faces of the selected meshes into new ID groups by material, island, boundary or face angle"""
+    bl_label = "Generate ID Groups"
+    bl_idname = "idmap.generate_id_groups"
+    bl_options = {"REGISTER", "UNDO"}
+
+    source: bpy.props.EnumProperty(
+        name="Partition By",
+        items=sources,
+        default="UV_ISLAND",
+    )
+
+    angle: bpy.props.FloatProperty(
+        name="Angle",
+        description="Maximum angle between neighboring faces of the same group",
+        subtype="ANGLE",
+        min=0,
+        max=radians(180),
+        default=radians(30),
+    )
+
+    group_name: bpy.props.StringProperty(
+        name="Group Name",
+        description="Name given to the new groups, followed by a number",
+        default="Island",
+    )
+
+    only_selected: bpy.props.BoolProperty(
+        name="Only Selected Faces",
+        description="Only partition the selected faces, leaving the other faces as they are",
+        default=False,
+    )
+
+    clear_existing: bpy.props.BoolProperty(
+        name="Clear Existing Groups",
+        description="Removes all existing ID groups before generating the new ones",
+        default=False,
+    )
+
+    max_groups: bpy.props.IntProperty(
+        name="Max Groups",
+        description="Meshes that would be split into more groups than this are skipped",
+        min=1,
+        default=256,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode in {"OBJECT", "EDIT_MESH"} and context.object != None and context.object.type == "MESH"
+
+    def execute(self, context):
+        total = 0
+
+        for obj in get_mesh_objects(context):
+            mesh = obj.data
+            id_map = mesh.id_map
+
+            prepare_id_mesh(obj)
+
+            face_mask = None
+            if self.only_selected and context.mode == "EDIT_MESH":
+                face_mask = get_face_selection(mesh)
+
+            labels, count, names = self.partition(mesh, face_mask)
+
+            if count > self.max_groups:
+                self.report({"WARNING"}, "Skipped %s, it would have been split into %d groups" % (obj.name, count))
+                continue
+
+            ids = read_face_ids(mesh)
+
+            if self.clear_existing:
+                id_map.groups.clear()
+                id_map.active_index = -1
+                id_map.touch()
+                ids[:] = -1
+
+            # create all of the groups up front, then assign them with a single write
+            offset = len(id_map.groups)
+            for name in names:
+                id_map.new_group(name)
+
+            assigned = labels >= 0
+            ids[assigned] = labels[assigned] + offset
+            write_face_ids(mesh, ids)
+            sync_to_editmode(obj)
+
+            total += count
+
+        self.report({"INFO"}, "Generated %d ID groups" % total)
+
+        return {"FINISHED"}
+
+    def partition(self, mesh, face_mask):
+        """Returns a group label per face (-1 for faces outside of the mask) along with the number of groups and their
+        names."""
+        if self.source == "MATERIAL":
+            materials = np.zeros(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get("material_index", materials)
+
+            labels = np.full(len(mesh.polygons), -1, dtype=np.int64)
+            mask = slice(None) if face_mask is None else face_mask
+            labels[mask], count = compact_labels(materials[mask])
+
+            # name the groups after the material of their slot
+            slots = np.zeros(count, dtype=np.int32)
+            slots[labels[labels >= 0]] = materials[labels >= 0]
+            names = []
+            for slot in slots:
+                mat = mesh.materials[slot] if slot < len(mesh.materials) else None
+                names.append(mat.name if mat is not None else "%s %d" % (self.group_name, slot))
+
+            return labels, count, names
+
+        labels, count = get_face_islands(
+            mesh,
+            face_mask,
+            delimit=delimiters[self.source],
+            angle=self.angle,
+            uv_layer=mesh.uv_layers.active,
+        )
+
+        return labels, count, ["%s %03d" % (self.group_name, i + 1) for i in range(count)]
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "source")
+
+        if self.source == "NORMAL":
+            layout.prop(self, "angle")
+
+        if self.source != "MATERIAL":
+            layout.prop(self, "group_name")
+
+        if context.mode == "EDIT_MESH":
+            layout.prop(self, "only_selected")
+
+        layout.prop(self, "clear_existing")
+        layout.prop(self, "max_groups")
@@ -0,0 +1,171 @@
+import bpy
+import numpy as np
+from .utils import (get_mesh_objects, prepare_id_mesh, read_face_ids, write_face_ids, get_face_selection,
+                    read_material_indices, write_material_indices, sync_to_editmode)
+
+
+def compact_material_slots(mesh, indices):
+    """Removes the material slots no face uses and returns the material indices remapped to the remaining slots."""
+    indices = np.minimum(indices, len(mesh.materials) - 1)
+    used = np.bincount(indices, minlength=len(mesh.materials)) > 0
+    if used.all():
+        return indices
+
+    remap = np.cumsum(used) - 1
+    materials = [mat for mat, keep in zip(mesh.materials, used) if keep]
+
+    mesh.materials.clear()
+    for mat in materials:
+        mesh.materials.append(mat)
+
+    return remap[indices].astype(np.int32)
+
+
+def groups_to_material_slots(mesh, prefix="", remove_unused=False):
+    """Gives each ID group of the mesh a material slot with a material named after the group (created with the group
+    color if it doesn't exist yet) and assigns it to the faces of the group. Unassigned faces keep their material."""
+    id_map = mesh.id_map
+    ids = read_face_ids(mesh)
+    indices = read_material_indices(mesh)
+    current = indices.copy()
+
+    slot_names = {mat.name: i for i, mat in enumerate(mesh.materials) if mat is not None}
+    group_slots = np.zeros(len(id_map.groups), dtype=np.int32)
+
+    for i, group in enumerate(id_map.groups):
+        name = prefix + group.name
+
+        mat = bpy.data.materials.get(name)
+        if mat == None:
+            mat = bpy.data.materials.new(name=name)
+            mat.diffuse_color = group.color
+
+        if name not in slot_names:
+            mesh.materials.append(mat)
+            slot_names[name] = len(mesh.materials) - 1
+        group_slots[i] = slot_names[name]
+
+    assigned = (ids >= 0) & (ids < len(group_slots))
+    indices[assigned] = group_slots[ids[assigned]]
+
+    if remove_unused:
+        count = len(mesh.materials)
+        indices = compact_material_slots(mesh, indices)
+        if len(mesh.materials) != count:
+            # clearing the slots moves every face to the first slot
+            current = np.zeros_like(current)
+
+    write_material_indices(mesh, indices, current)
+
+
+def material_slots_to_groups(mesh, face_mask=None):
+    """Assigns the faces of each material slot to an ID group named after the slot's material (created with the
+    material's viewport color if it doesn't exist yet, or a unique color if a group already has that one). Returns the
+    number of slots that were converted."""
+    id_map = mesh.id_map
+    ids = read_face_ids(mesh)
+
+    # faces pointing past the last slot use the last slot, like they do when rendering
+    indices = np.minimum(read_material_indices(mesh), len(mesh.materials) - 1)
+    mask = slice(None) if face_mask is None else face_mask
+
+    slot_groups = np.full(len(mesh.materials), -1, dtype=np.int64)
+    slots = np.unique(indices[mask])
+
+    for slot in slots:
+        mat = mesh.materials[int(slot)]
+        if mat is not None:
+            # materials left at the default viewport color would all share it, so only unused colors are taken over
+            color = None if id_map.is_color_used(mat.diffuse_color) else mat.diffuse_color
+            group = id_map.find_or_create_group(mat.name, color)
+        else:
+            group = id_map.find_or_create_group("Slot %d" % (slot + 1))
+        slot_groups[slot] = id_map.get_group_index(group.name)
+
+    ids[mask] = slot_groups[indices[mask]]
+    write_face_ids(mesh, ids)
+
+    return len(slots)
+
+
+class ID_GroupsToMaterialSlots(bpy.types.Operator):
+    """Creates a material slot per ID group of the selected meshes and assigns it to the faces of the group"""
+    bl_label = "ID Groups to Material Slots"
+    bl_idname = "idmap.groups_to_material_slots"
+    bl_options = {"REGISTER", "UNDO"}
+
+    prefix: bpy.props.StringProperty(
+        name="Prefix",
+        description="Text put in front of the group names to get the material names",
+        default="",
+    )
+
+    remove_unused: bpy.props.BoolProperty(
+        name="Remove Unused Slots",
+        description="Removes the material slots that no face uses anymore",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode in {"OBJECT", "EDIT_MESH"} and context.object != None and context.object.type == "MESH"
+
+    def execute(self, context):
+        count = 0
+
+        for obj in get_mesh_objects(context):
+            mesh = obj.data
+            if len(mesh.id_map.groups) == 0:
+                continue
+
+            prepare_id_mesh(obj)
+            groups_to_material_slots(mesh, self.prefix, self.remove_unused)
+            sync_to_editmode(obj)
+
+            count += 1
+
+        self.report({"INFO"}, "Converted the ID groups of %d meshes" % count)
+
+        return {"FINISHED"}
+
+
+class ID_MaterialSlotsToGroups(bpy.types.Operator):
+    """Assigns the faces of each material slot of the selected meshes to an ID group named after the material"""
+    bl_label = "Material Slots to ID Groups"
+    bl_idname = "idmap.material_slots_to_groups"
+    bl_options = {"REGISTER", "UNDO"}
+
+    only_selected: bpy.props.BoolProperty(
+        name="Only Selected Faces",
+        description="Only convert the selected faces, leaving the other faces as they are",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode in {"OBJECT", "EDIT_MESH"} and context.object != None and context.object.type == "MESH"
+
+    def execute(self, context):
+        total = 0
+
+        for obj in get_mesh_objects(context):
+            mesh = obj.data
+            if len(mesh.materials) == 0:
+                continue
+
+            prepare_id_mesh(obj)
+
+            face_mask = None
+            if self.only_selected and context.mode == "EDIT_MESH":
+                face_mask = get_face_selection(mesh)
+
+            total += material_slots_to_groups(mesh, face_mask)
+            sync_to_editmode(obj)
+
+        self.report({"INFO"}, "Converted %d material slots" % total)
+
+        return {"FINISHED"}
+
+    def draw(self, context):
+        if context.mode == "EDIT_MESH":
+            self.layout.prop(self, "only_selected")
@@ -1,5 +1,5 @@
 import bpy
-from .utils import paint_selected_faces, select_faces_by_color
+from .utils import prepare_id_mesh, read_face_ids, write_face_ids, sync_to_editmode
 
 
 class ID_RemoveGroup(bpy.types.Operator):
@@ -13,18 +13,25 @@ class ID_RemoveGroup(bpy.types.Operator):
         return context.object != None and context.object.type == "MESH"
 
     def execute(self, context):
-        id_map = context.object.data.id_map
+        obj = context.object
+        mesh = obj.data
+        id_map = mesh.id_map
 
         # get the group that we're going to remove
-        group = id_map.active
-        if group == None:
+        index = id_map.active_index
+        if id_map.active == None:
             return {"FINISHED"}
 
+        prepare_id_mesh(obj)
+        ids = read_face_ids(mesh)
+
         # remove the map
         id_map.remove_active()
 
-        # paint away the colors for the group
-        select_faces_by_color(context, group.color)
-        paint_selected_faces(context, (0, 0, 0, 1))
+        # unassign the faces of the group and shift down the indices of the groups that came after it
+        ids[ids == index] = -1
+        ids[ids > index] -= 1
+        write_face_ids(mesh, ids)
+        sync_to_editmode(obj)
 
         return {"FINISHED"}
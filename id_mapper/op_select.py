@@ -1,33 +1,81 @@
 import bpy
-from .utils import select_faces_by_color
+from .utils import select_faces_by_groups
 
 actions = [
-    ("SELECT", "Select by ID Group", ""),
+    ("SELECT", "Select", "Select the faces assigned to the ID group"),
+    ("DESELECT", "Deselect", "Deselect the faces assigned to the ID group"),
+    ("INVERT", "Invert", "Select the faces that aren't assigned to the ID group"),
 ]
 
 
+class ID_GroupNameItem(bpy.types.PropertyGroup):
+    """Name of an ID group passed to an operator, along with whether the group is used."""
+    use: bpy.props.BoolProperty(name="Use", default=True)
+
+
 class ID_SelectByActiveGroup(bpy.types.Operator):
-    """Makes a selection of faces based on the ID groups and their assigned colors"""
+    """Makes a selection of faces based on the ID groups they are assigned to"""
     bl_idname = "idmap.select_by_id_group"
     bl_label = "Select by Active ID Group"
     bl_options = {"REGISTER", "UNDO"}
 
-    # TODO: use selection mode to select by, unselect by or invert by the group
     action: bpy.props.EnumProperty(items=actions, name="Selection Mode", default="SELECT")
 
+    extend: bpy.props.BoolProperty(
+        name="Extend",
+        description="Extend the current selection instead of replacing it",
+        default=False,
+    )
+
+    group_name: bpy.props.StringProperty(
+        name="Group Name",
+        description="Name of the ID group to select by, the active group is used when left empty",
+    )
+
+    group_names: bpy.props.CollectionProperty(
+        name="Group Names",
+        description="Names of the ID groups to select by, used instead of the group name when any of them is used",
+        type=ID_GroupNameItem,
+        options={"SKIP_SAVE"},
+    )
+
     @classmethod
     def poll(cls, context):
         return context.mode == "EDIT_MESH"
 
+    def invoke(self, context, event):
+        # offer every group of the active mesh, starting out with just the active one
+        if len(self.group_names) == 0:
+            id_map = context.object.data.id_map
+            for index, name in enumerate(id_map.get_group_names()):
+                item = self.group_names.add()
+                item.name = name
+                item.use = index == id_map.active_index
+
+        return context.window_manager.invoke_props_dialog(self)
+
     def execute(self, context):
         id_map = context.object.data.id_map
+        names = [item.name for item in self.group_names if item.use]
 
-        # get the currently active group
-        group = id_map.active
-        if group == None:
-            return {"CANCELLED"}
+        # get the requested group or fall back to the currently active one
+        if len(names) == 0:
+            group = id_map.get_group_by_name(self.group_name) if self.group_name else id_map.active
+            if group == None:
+                return {"CANCELLED"}
+            names.append(group.name)
 
-        # select by the group color
-        select_faces_by_color(context, group.color)
+        # select by the groups on every mesh being edited
+        select_faces_by_groups(context, names, self.action, self.extend)
 
         return {"FINISHED"}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "action")
+        layout.prop(self, "extend")
+
+        if len(self.group_names) > 0:
+            col = layout.column(align=True)
+            for item in self.group_names:
+                col.prop(item, "use", text=item.name)
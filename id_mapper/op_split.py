@@ -0,0 +1,96 @@
+import bpy
+import numpy as np
+from ..mesh.extract import MeshSource, extract_mesh, copy_object_data
+from ..mesh.weights import read_vertex_weights
+from .utils import get_mesh_objects, ensure_id_layers, prepare_id_mesh, read_face_ids, write_face_ids, sync_to_editmode
+
+
+def split_by_groups(obj, include_unassigned=False):
+    """Creates a new object for each ID group of the mesh object, holding the faces of that group, and returns them.
+    The faces are partitioned by group in a single sort and the arrays of the source mesh are read once, after which
+    every mesh is only built from slices of them. The new objects share the transform, parent, collections, vertex
+    groups and shape keys of the source object."""
+    mesh = obj.data
+    id_map = mesh.id_map
+
+    prepare_id_mesh(obj)
+    ids = read_face_ids(mesh)
+    sync_to_editmode(obj)
+
+    # sorting puts the faces of each group next to each other, the unassigned ones (-1) first
+    order = np.argsort(ids, kind="stable")
+    counts = np.bincount(ids + 1, minlength=len(id_map.groups) + 1)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+
+    source = MeshSource(mesh)
+    weights = read_vertex_weights(mesh) if len(obj.vertex_groups) > 0 else None
+    objects = []
+
+    for index in range(-1, len(id_map.groups)):
+        start, end = starts[index + 1], ends[index + 1]
+        if start == end or (index < 0 and not include_unassigned):
+            continue
+
+        group = id_map.get_group_by_index(index) if index >= 0 else None
+        name = group.name if group is not None else obj.name + " Unassigned"
+
+        new_mesh, verts = extract_mesh(source, name, order[start:end])
+
+        # the new mesh only knows about its own group
+        ensure_id_layers(new_mesh)
+        new_ids = np.full(end - start, -1, dtype=np.int32)
+        if group is not None:
+            new_mesh.id_map.new_group(group.name, make_active=True, color=group.color)
+            new_ids[:] = 0
+        write_face_ids(new_mesh, new_ids)
+
+        new_obj = bpy.data.objects.new(name, new_mesh)
+        copy_object_data(obj, new_obj, source, verts, weights)
+        objects.append(new_obj)
+
+    return objects
+
+
+class ID_SplitByGroups(bpy.types.Operator):
+    """Creates a separate object from the faces of each ID group, named after the group"""
+    bl_label = "Split by ID Groups"
+    bl_idname = "idmap.split_by_id_groups"
+    bl_options = {"REGISTER", "UNDO"}
+
+    include_unassigned: bpy.props.BoolProperty(
+        name="Include Unassigned",
+        description="Also create an object from the faces that aren't assigned to any ID group",
+        default=False,
+    )
+
+    hide_original: bpy.props.BoolProperty(
+        name="Hide Original",
+        description="Hides the source objects once they've been split",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode in {"OBJECT", "EDIT_MESH"} and context.object != None and context.object.type == "MESH"
+
+    def execute(self, context):
+        count = 0
+
+        for obj in get_mesh_objects(context):
+            if len(obj.data.id_map.groups) == 0:
+                continue
+
+            objects = split_by_groups(obj, self.include_unassigned)
+            count += len(objects)
+
+            if context.mode == "OBJECT":
+                for new_obj in objects:
+                    new_obj.select_set(True)
+
+            if self.hide_original:
+                obj.hide_set(True)
+
+        self.report({"INFO"}, "Created %d objects" % count)
+
+        return {"FINISHED"}
@@ -0,0 +1,144 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# NOTE: this module doesn't import bpy, the tiles are rasterized on worker threads which must not touch Blender data.
+# Threads rather than processes are used as forking the running Blender process isn't safe and spawned processes can't
+# import the addon, the NumPy kernels release the GIL for most of their work so the tiles still run in parallel
+
+# upper limit for the number of candidate pixels evaluated at once, keeps memory in check for very large triangles
+MAX_CANDIDATES = 1 << 22
+
+
+def rasterize(triangles, colors, width, height, tile_size=256, threads=0, padding=0):
+    """Rasterizes flat colored triangles into an RGBA image and returns it as a (height, width, 4) float32 array.
+
+    triangles:  (N, 3, 2) array of triangle corners in pixel coordinates (0, 0 being the bottom left image corner)
+    colors:     (N, 4) array with the color of each triangle
+    tile_size:  size of the square tiles the image is split into, each tile is rasterized independently
+    threads:    number of worker threads used to rasterize the tiles, 0 rasterizes on the calling thread
+    padding:    number of pixels to dilate the triangle colors by into the empty space around them
+    """
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 2)
+    colors = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+
+    # drop degenerate triangles up front as they can't cover any pixel centers
+    area = cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    keep = area != 0
+    triangles = triangles[keep]
+    colors = colors[keep]
+
+    # pixel bounds of each triangle, a pixel is covered when its center (x + 0.5, y + 0.5) lies within the triangle
+    lower = np.floor(triangles.min(axis=1) - 0.5).astype(np.int64) + 1
+    upper = np.ceil(triangles.max(axis=1) - 0.5).astype(np.int64) - 1
+
+    jobs = []
+    for y0 in range(0, height, tile_size):
+        for x0 in range(0, width, tile_size):
+            x1 = min(x0 + tile_size, width)
+            y1 = min(y0 + tile_size, height)
+            hit = (lower[:, 0] < x1) & (upper[:, 0] >= x0) & (lower[:, 1] < y1) & (upper[:, 1] >= y0)
+            if hit.any():
+                jobs.append((x0, y0, x1, y1, triangles[hit], colors[hit]))
+
+    image = np.zeros((height, width, 4), dtype=np.float32)
+    filled = np.zeros((height, width), dtype=bool)
+
+    for (x0, y0, x1, y1, _, _), (tile, tile_filled) in zip(jobs, run_jobs(jobs, threads)):
+        image[y0:y1, x0:x1] = tile
+        filled[y0:y1, x0:x1] = tile_filled
+
+    if padding > 0:
+        dilate(image, filled, padding)
+
+    return image
+
+
+def run_jobs(jobs, threads):
+    """Rasterizes the tiles in a thread pool, or on the calling thread when there's nothing to split the work over."""
+    if threads > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(threads, len(jobs))) as executor:
+            return list(executor.map(rasterize_tile, jobs))
+
+    return [rasterize_tile(job) for job in jobs]
+
+
+def rasterize_tile(job):
+    """Rasterizes the given triangles into a single tile and returns the tile colors along with a coverage mask."""
+    x0, y0, x1, y1, triangles, colors = job
+    tile = np.zeros((y1 - y0, x1 - x0, 4), dtype=np.float32)
+    filled = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+
+    # clip the pixel bounds of each triangle to the tile
+    lower = np.floor(triangles.min(axis=1) - 0.5).astype(np.int64) + 1
+    upper = np.ceil(triangles.max(axis=1) - 0.5).astype(np.int64) - 1
+    lower = np.maximum(lower, (x0, y0))
+    upper = np.minimum(upper, (x1 - 1, y1 - 1))
+    size = np.maximum(upper - lower + 1, 0)
+    counts = size[:, 0] * size[:, 1]
+
+    # split the triangles into batches so that the number of candidate pixels per batch stays bounded
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(triangles):
+        stop = max(int(np.searchsorted(ends, (ends[start - 1] if start > 0 else 0) + MAX_CANDIDATES, "right")), start + 1)
+        batch = slice(start, stop)
+        start = stop
+
+        # enumerate every pixel in the bounds of each triangle of the batch
+        tri = np.repeat(np.arange(batch.start, batch.stop), counts[batch])
+        if len(tri) == 0:
+            continue
+        offsets = np.cumsum(counts[batch]) - counts[batch]
+        local = np.arange(len(tri)) - np.repeat(offsets, counts[batch])
+        x = lower[tri, 0] + local % size[tri, 0]
+        y = lower[tri, 1] + local // size[tri, 0]
+
+        # test the pixel centers against the edges of the triangles, accepting either winding order
+        a, b, c = triangles[tri, 0], triangles[tri, 1], triangles[tri, 2]
+        p = np.stack((x + 0.5, y + 0.5), axis=1)
+        sign = np.sign(cross(b - a, c - a))
+        inside = (
+            (cross(b - a, p - a) * sign >= 0) &
+            (cross(c - b, p - b) * sign >= 0) &
+            (cross(a - c, p - c) * sign >= 0)
+        )
+
+        # later triangles win where triangles overlap
+        tile[y[inside] - y0, x[inside] - x0] = colors[tri[inside]]
+        filled[y[inside] - y0, x[inside] - x0] = True
+
+    return tile, filled
+
+
+def dilate(image, filled, iterations):
+    """Grows the filled pixels of the image outwards into the empty pixels by the given number of pixels."""
+    neighbors = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1))
+    height, width = filled.shape
+
+    for _ in range(iterations):
+        grown = filled.copy()
+
+        for dy, dx in neighbors:
+            # destination and source slices for shifting the image by (dy, dx)
+            dst = (slice(max(dy, 0), height + min(dy, 0)), slice(max(dx, 0), width + min(dx, 0)))
+            src = (slice(max(-dy, 0), height + min(-dy, 0)), slice(max(-dx, 0), width + min(-dx, 0)))
+
+            take = ~grown[dst] & filled[src]
+            image[dst][take] = image[src][take]
+            grown[dst] |= take
+
+        if grown.sum() == filled.sum():
+            break
+
+        filled[:] = grown
+
+
+def cross(a, b):
+    """Returns the z component of the cross product of 2D vectors."""
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def default_threads():
+    """Returns the number of worker threads to use when none are specified."""
+    return max(1, (os.cpu_count() or 1) - 1)
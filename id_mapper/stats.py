@@ -0,0 +1,130 @@
+import bpy
+import bmesh
+import numpy as np
+from .caches import mesh_cache
+from .utils import INDEX_ATTRIBUTE, get_loop_faces, read_face_ids, read_edit_mesh
+from .topology import get_next_loops
+
+# group statistics per mesh along with the signature they were computed for. Writing the ID groups counts as a geometry
+# update, so entries are validated against the signature instead of being dropped on every update
+group_stats = mesh_cache(geometry=False)
+
+# pointers of the meshes whose statistics are scheduled to be recomputed
+pending_stats = set()
+
+
+class ID_GroupStats:
+    """Face count, surface area and UV area (as a fraction of the UV space) of each ID group of a mesh."""
+
+    def __init__(self, count):
+        self.count = count
+        self.faces = np.zeros(count, dtype=np.int64)
+        self.area = np.zeros(count)
+        self.uv_area = np.zeros(count)
+
+
+def get_stats_signature(mesh):
+    """Returns a value that changes whenever the topology of the mesh, its ID groups, the faces assigned to them or the
+    active UV map change. Only reads counters, so it is cheap enough to be checked while drawing."""
+    if mesh.is_editmode:
+        bm = bmesh.from_edit_mesh(mesh)
+        counts = (len(bm.verts), len(bm.edges), len(bm.faces))
+    else:
+        counts = (len(mesh.vertices), len(mesh.edges), len(mesh.polygons))
+
+    id_map = mesh.id_map
+    return counts + (len(id_map.groups), id_map.revision, id_map.face_revision, mesh.uv_layers.active_index)
+
+
+def compute_mesh_stats(mesh, count):
+    """Computes the statistics of the first `count` ID groups of the mesh in one pass over the faces. The mesh must not
+    be in edit-mode."""
+    stats = ID_GroupStats(count)
+
+    if mesh.attributes.get(INDEX_ATTRIBUTE) is None or count == 0:
+        return stats
+
+    ids = read_face_ids(mesh)
+    valid = (ids >= 0) & (ids < count)
+    ids = ids[valid]
+
+    areas = np.zeros(len(mesh.polygons), dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+
+    stats.faces = np.bincount(ids, minlength=count)
+    stats.area = np.bincount(ids, weights=areas[valid], minlength=count)
+
+    uv_layer = mesh.uv_layers.active
+    if uv_layer is not None:
+        uvs = np.zeros(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+        next_uvs = uvs[get_next_loops(mesh)]
+
+        # shoelace formula summed per face
+        cross = uvs[:, 0] * next_uvs[:, 1] - next_uvs[:, 0] * uvs[:, 1]
+        uv_areas = np.abs(np.bincount(get_loop_faces(mesh), weights=cross, minlength=len(mesh.polygons))) / 2
+        stats.uv_area = np.bincount(ids, weights=uv_areas[valid], minlength=count)
+
+    return stats
+
+
+def compute_group_stats(obj):
+    """Computes the statistics of every ID group of the object's mesh. The layers of a mesh in edit-mode can't be read
+    in bulk, so those are read from a temporary copy of the edit-mesh rather than by writing to the mesh itself."""
+    mesh = obj.data
+    count = len(mesh.id_map.groups)
+
+    if not mesh.is_editmode:
+        return compute_mesh_stats(mesh, count)
+    return read_edit_mesh(mesh, lambda copy: compute_mesh_stats(copy, count))
+
+
+def update_group_stats(obj):
+    """Recomputes the cached statistics of the ID groups of the object's mesh and returns them."""
+    mesh = obj.data
+    signature = get_stats_signature(mesh)
+    stats = compute_group_stats(obj)
+    group_stats[mesh.as_pointer()] = (signature, stats)
+    return stats
+
+
+def get_group_stats(obj):
+    """Returns the cached statistics of the ID groups of the object's mesh, or None if there are none yet. Nothing is
+    computed here so that this can be called while drawing, outdated statistics are returned as they are while new ones
+    are computed on a timer."""
+    mesh = obj.data
+    key = mesh.as_pointer()
+    entry = group_stats.get(key)
+
+    if entry is None or entry[0] != get_stats_signature(mesh):
+        request_group_stats(obj)
+
+    return entry[1] if entry is not None else None
+
+
+def request_group_stats(obj):
+    """Schedules the statistics of the ID groups of the object's mesh to be recomputed once drawing is done."""
+    key = obj.data.as_pointer()
+    if key in pending_stats:
+        return
+    pending_stats.add(key)
+
+    # the object is looked up again as it may be gone by the time the timer runs
+    name = obj.name
+
+    def refresh():
+        pending_stats.discard(key)
+        obj = bpy.data.objects.get(name)
+        if obj is None or obj.type != "MESH" or obj.data.as_pointer() != key:
+            return None
+
+        update_group_stats(obj)
+
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == "PROPERTIES":
+                    area.tag_redraw()
+        return None
+
+    bpy.app.timers.register(refresh, first_interval=0.1)
@@ -0,0 +1,192 @@
+import numpy as np
+from .caches import mesh_cache
+from .utils import get_loop_faces
+
+# face adjacency per mesh, see get_face_adjacency. Edits that don't change the topology (like writing the ID groups)
+# still count as geometry updates, so entries are validated against the topology signature instead
+face_adjacency = mesh_cache(geometry=False)
+
+
+def union_find(count, a, b):
+    """Returns the connected component of each of the `count` elements given the pairs of connected elements (a, b).
+    Each component is labeled by the smallest element index within it.
+
+    Works on all pairs at once: the roots of every still disconnected pair are hooked onto the smaller root, then the
+    parent pointers are compressed until each element points directly at its root, which is repeated until no pair
+    spans two components."""
+    parent = np.arange(count)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+
+    while len(a) > 0:
+        root_a = parent[a]
+        root_b = parent[b]
+        differ = root_a != root_b
+        if not differ.any():
+            break
+
+        a, b, root_a, root_b = a[differ], b[differ], root_a[differ], root_b[differ]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    return parent
+
+
+def compact_labels(labels):
+    """Renumbers the labels to 0..N-1 in order of their first appearance and returns the new labels along with N."""
+    unique, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first))
+    return order[inverse].reshape(-1), len(unique)
+
+
+def get_next_loops(mesh):
+    """Returns the index of the next loop around the face for each loop of the mesh."""
+    count = len(mesh.polygons)
+    starts = np.zeros(count, dtype=np.int32)
+    totals = np.zeros(count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", starts)
+    mesh.polygons.foreach_get("loop_total", totals)
+
+    next_loops = np.arange(1, len(mesh.loops) + 1, dtype=np.int32)
+    next_loops[starts + totals - 1] = starts
+    return next_loops
+
+
+def get_face_pairs(mesh):
+    """Returns the pairs of loops (a, b) of faces that share an edge. Faces around edges with more than two faces are
+    chained together pair by pair."""
+    edges = np.zeros(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", edges)
+
+    order = np.argsort(edges, kind="stable")
+    shared = edges[order[1:]] == edges[order[:-1]]
+    return order[:-1][shared], order[1:][shared]
+
+
+def get_uv_continuity(mesh, loops_a, loops_b, uv_layer, tolerance=1e-5):
+    """Returns whether the UVs of each pair of loops match along the shared edge, i.e. whether both faces lie in the
+    same UV island."""
+    verts = np.zeros(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", verts)
+
+    uvs = np.zeros(len(mesh.loops) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get("uv", uvs)
+    uvs = uvs.reshape(-1, 2)
+
+    next_loops = get_next_loops(mesh)
+    next_a = next_loops[loops_a]
+    next_b = next_loops[loops_b]
+
+    def close(x, y):
+        return (np.abs(uvs[x] - uvs[y]) <= tolerance).all(axis=1)
+
+    # the loops either run along the edge in the same direction or, in the common case, in opposite directions
+    same_direction = verts[loops_a] == verts[loops_b]
+    return np.where(
+        same_direction,
+        close(loops_a, loops_b) & close(next_a, next_b),
+        close(loops_a, next_b) & close(next_a, loops_b),
+    )
+
+
+def get_face_islands(mesh, face_mask=None, delimit=(), angle=0.0, uv_layer=None):
+    """Returns a label per face identifying the island of connected faces it belongs to, along with the number of
+    islands. Faces outside of the mask are labeled -1.
+
+    delimit:  Any of "SEAM", "SHARP", "MATERIAL", "UV" and "NORMAL" to stop islands from spreading across seams, sharp
+              edges, material changes, UV island borders or edges whose faces differ by more than the given angle
+    """
+    loops_a, loops_b = get_face_pairs(mesh)
+    loop_faces = get_loop_faces(mesh)
+    faces_a = loop_faces[loops_a]
+    faces_b = loop_faces[loops_b]
+
+    connected = np.ones(len(loops_a), dtype=bool)
+
+    if face_mask is not None:
+        connected &= face_mask[faces_a] & face_mask[faces_b]
+
+    if "SEAM" in delimit or "SHARP" in delimit:
+        edges = np.zeros(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("edge_index", edges)
+
+        for flag, prop in (("SEAM", "use_seam"), ("SHARP", "use_edge_sharp")):
+            if flag in delimit:
+                values = np.zeros(len(mesh.edges), dtype=bool)
+                mesh.edges.foreach_get(prop, values)
+                connected &= ~values[edges[loops_a]]
+
+    if "MATERIAL" in delimit:
+        materials = np.zeros(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", materials)
+        connected &= materials[faces_a] == materials[faces_b]
+
+    if "UV" in delimit and uv_layer is not None:
+        connected &= get_uv_continuity(mesh, loops_a, loops_b, uv_layer)
+
+    if "NORMAL" in delimit:
+        normals = np.zeros(len(mesh.polygons) * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("normal", normals)
+        normals = normals.reshape(-1, 3)
+        connected &= (normals[faces_a] * normals[faces_b]).sum(axis=1) >= np.cos(angle)
+
+    roots = union_find(len(mesh.polygons), faces_a[connected], faces_b[connected])
+
+    labels = np.full(len(mesh.polygons), -1, dtype=np.int64)
+    mask = slice(None) if face_mask is None else face_mask
+    labels[mask], count = compact_labels(roots[mask])
+    return labels, count
+
+
+def get_topology_signature(mesh):
+    """Returns a value that changes whenever the topology of the mesh changes, reading the loop indices is far cheaper
+    than rebuilding anything derived from them."""
+    verts = np.zeros(len(mesh.loops), dtype=np.int32)
+    edges = np.zeros(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", verts)
+    mesh.loops.foreach_get("edge_index", edges)
+    return (len(mesh.vertices), len(mesh.edges), len(mesh.polygons), hash(verts.tobytes()), hash(edges.tobytes()))
+
+
+class FaceAdjacency:
+    """Face to face adjacency in compressed sparse row form: the neighbors of face i are
+    neighbors[offsets[i]:offsets[i + 1]] and they're connected to it through the edges at the same positions in edges."""
+
+    def __init__(self, mesh):
+        self.signature = get_topology_signature(mesh)
+
+        loops_a, loops_b = get_face_pairs(mesh)
+        loop_faces = get_loop_faces(mesh)
+        loop_edges = np.zeros(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("edge_index", loop_edges)
+
+        faces = np.concatenate((loop_faces[loops_a], loop_faces[loops_b]))
+        neighbors = np.concatenate((loop_faces[loops_b], loop_faces[loops_a]))
+        edges = np.concatenate((loop_edges[loops_a], loop_edges[loops_a]))
+
+        order = np.argsort(faces, kind="stable")
+        self.neighbors = neighbors[order]
+        self.edges = edges[order]
+        self.offsets = np.zeros(len(mesh.polygons) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(faces, minlength=len(mesh.polygons)), out=self.offsets[1:])
+
+    def expand(self, faces):
+        """Returns every (face, neighbor, edge) triplet for the given faces as three arrays."""
+        starts = self.offsets[faces]
+        counts = self.offsets[faces + 1] - starts
+        positions = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        return np.repeat(faces, counts), self.neighbors[positions], self.edges[positions]
+
+
+def get_face_adjacency(mesh):
+    """Returns the cached face adjacency of the mesh, rebuilding it if the topology of the mesh changed."""
+    key = mesh.as_pointer()
+    adjacency = face_adjacency.get(key)
+    if adjacency is None or adjacency.signature != get_topology_signature(mesh):
+        adjacency = face_adjacency[key] = FaceAdjacency(mesh)
+    return adjacency
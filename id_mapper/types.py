@@ -1,36 +1,125 @@
 import bpy
-from mathutils import Color
+import colorsys
+import numpy as np
 from bpy.props import IntProperty, FloatVectorProperty, StringProperty, CollectionProperty
-from random import uniform
+from random import randrange
+from .stats import get_group_stats
+
+# hue step used to walk the color wheel, consecutive steps are spread as far apart as possible
+GOLDEN_RATIO_CONJUGATE = 0.618033988749895
+
+# saturation/value tiers cycled through as the hue wraps around so that groups with similar hues stay distinguishable
+COLOR_TIERS = ((0.85, 0.95), (0.55, 0.75), (0.95, 0.55))
+
+# minimum perceptual distance (0 - 1) between a new group color and the existing ones
+MIN_COLOR_DISTANCE = 0.12
+
+# lookup tables per ID map keyed by the pointer of the ID map
+group_indices = {}
+
+# filter flags and display order of the groups list per ID map, see ID_UL_IDGroupsList.filter_items
+group_list_filters = {}
+
+
+def on_group_changed(self, context):
+    self.id_data.id_map.touch()
+
+
+def color_key(color):
+    """Returns the hashable key used to detect duplicate colors at the precision they are stored in vertex colors."""
+    return tuple(int(round(c * 255)) for c in color[:3])
+
+
+def color_distance(palette, color):
+    """Returns the approximate perceptual distance (0 - 1) between each color of the palette and the given color."""
+    mean_red = (palette[:, 0] + color[0]) / 2
+    delta = palette[:, :3] - np.asarray(color[:3], dtype=np.float32)
+    return np.sqrt((2 + mean_red) * delta[:, 0] ** 2 + 4 * delta[:, 1] ** 2 + (3 - mean_red) * delta[:, 2] ** 2) / 3
+
+
+class ID_GroupIndex:
+    """Lookup tables for the groups of an ID map that are rebuilt whenever the groups change."""
+
+    def __init__(self, id_map):
+        self.revision = id_map.revision
+        self.count = len(id_map.groups)
+        self.names = {group.name: index for index, group in enumerate(id_map.groups)}
+        self.colors = [tuple(group.color) for group in id_map.groups]
+        self.color_keys = {color_key(color) for color in self.colors}
+        self.color_keys.add(color_key((0, 0, 0)))
+        self.suffixes = {}
+
+    def add(self, id_map, name, color):
+        self.names[name] = self.count
+        self.colors.append(tuple(color))
+        self.color_keys.add(color_key(color))
+        self.count += 1
+        self.revision = id_map.revision
 
 
 class ID_Group(bpy.types.PropertyGroup):
-    name: StringProperty(name="Group Name")
-    color: FloatVectorProperty(name="Group Color", size=4)
+    name: StringProperty(name="Group Name", update=on_group_changed)
+    color: FloatVectorProperty(name="Group Color", size=4, update=on_group_changed)
 
 
+# group membership of each face is stored as the group index in the mesh's integer "ID Index" face attribute (see
+# utils.read_face_ids), the groups themselves only hold the name and the color used for display and export
 class ID_Map(bpy.types.PropertyGroup):
     active_index: IntProperty(name="Active Index", default=-1)
     groups: CollectionProperty(name="ID Groups", type=ID_Group)
 
+    revision: IntProperty(
+        name="Revision",
+        description="Changes whenever the groups are modified, used to invalidate cached lookups",
+    )
+
+    face_revision: IntProperty(
+        name="Face Revision",
+        description="Changes whenever faces are assigned to the groups, used to invalidate cached statistics",
+    )
+
+    color_step: IntProperty(
+        name="Color Step",
+        description="Position in the color sequence used to pick the color of the next group",
+    )
+
     @property
     def active(self):
         """Returns the current group with the index that matches the set 'active_index_id' or None if one can't be found."""
         return self.get_group_by_index(self.active_index)
 
-    def find_or_create_group(self, name):
+    @property
+    def index(self):
+        """Returns the lookup tables for the groups, rebuilding them if the groups changed since they were last built."""
+        key = self.as_pointer()
+        index = group_indices.get(key)
+        if index is None or index.revision != self.revision or index.count != len(self.groups):
+            index = group_indices[key] = ID_GroupIndex(self)
+        return index
+
+    def touch(self):
+        """Marks the groups as modified so that cached lookups get rebuilt. A random value is used rather than a counter
+        so that a revision restored by undo can't be mistaken for a newer one."""
+        self.revision = randrange(1, 2 ** 31 - 1)
+
+    def touch_faces(self):
+        """Marks the faces assigned to the groups as modified, see touch."""
+        self.face_revision = randrange(1, 2 ** 31 - 1)
+
+    def find_or_create_group(self, name, color=None):
         """Will attempt to find and return a group with the specified name, otherwise a new group will be created and returned."""
         group = self.get_group_by_name(name)
         if group == None:
-            group = self.new_group(name)
+            group = self.new_group(name, color=color)
         return group
 
     def get_group_by_name(self, name):
         """Will attempt to find and return a group with the specified name, otherwise None will be returned."""
-        for group in self.groups:
-            if group.name == name:
-                return group
-        return None
+        return self.get_group_by_index(self.get_group_index(name))
+
+    def get_group_index(self, name):
+        """Returns the index of the group with the specified name, otherwise -1 is returned."""
+        return self.index.names.get(name, -1)
 
     def get_group_by_index(self, index):
         """Returns the group that exists at the corresponding index if found, otherwise None is returned."""
@@ -39,38 +128,60 @@ class ID_Map(bpy.types.PropertyGroup):
             return None
         return self.groups[index]
 
-    def new_group(self, name, make_active=False):
-        """Create and returns a new ID group with a unique color."""
-        names = self.get_group_names()
-
-        if len(names) == 0:
-            pass
-
-        elif name in names:
-            count = 1
-            while True:
-                new_name = "{}.{:03d}".format(name, count)
-                if new_name not in names:
-                    name = new_name
-                    break
+    def new_group(self, name, make_active=False, color=None):
+        """Create and returns a new ID group with a unique name and color (unless a color is given)."""
+        index = self.index
+        name = self.get_unique_name(name)
+        color = self.get_unique_color() if color is None else tuple(color)
 
         new_group = self.groups.add()
         new_group.name = name
-        new_group.color = self.get_unique_color()
+        new_group.color = color
+        index.add(self, name, color)
 
         if make_active or self.active_index < 0 or self.active_index >= len(self.groups):
             self.active_index = len(self.groups) - 1
 
         return new_group
 
+    def get_unique_name(self, name):
+        """Returns the name with a numeric suffix appended if a group with the same name already exists."""
+        index = self.index
+        if name not in index.names:
+            return name
+
+        count = index.suffixes.get(name, 1)
+        while "{}.{:03d}".format(name, count) in index.names:
+            count += 1
+
+        index.suffixes[name] = count + 1
+        return "{}.{:03d}".format(name, count)
+
+    def is_color_used(self, color):
+        """Returns whether a group already has the color, or one that looks the same once stored in vertex colors.
+        Black is always in use as it marks the unassigned faces."""
+        return color_key(color) in self.index.color_keys
+
     def get_unique_color(self):
-        """Generates a unique color for the ID map."""
-        colors = [group.color for group in self.groups]
+        """Generates a unique color for the ID map by stepping around the hue wheel by the golden ratio, skipping colors
+        that are too close to the ones already in use."""
+        index = self.index
+        palette = np.array(index.colors, dtype=np.float32).reshape(-1, 4)
+        min_distance = MIN_COLOR_DISTANCE
 
         while True:
-            color = (uniform(0, 1), uniform(0, 1), uniform(0, 1), 1)
-            if color not in colors and color != (0, 0, 0, 1):
-                return color
+            step = self.color_step
+            self.color_step += 1
+
+            saturation, value = COLOR_TIERS[int(step * GOLDEN_RATIO_CONJUGATE) % len(COLOR_TIERS)]
+            color = (*colorsys.hsv_to_rgb((step * GOLDEN_RATIO_CONJUGATE) % 1.0, saturation, value), 1)
+
+            if color_key(color) not in index.color_keys:
+                if len(palette) == 0 or color_distance(palette, color).min() >= min_distance:
+                    return color
+
+            # relax the distance requirement as the palette fills up
+            min_distance *= 0.8
 
     def get_group_names(self):
         """Returns a list containing the names of each group."""
@@ -90,17 +201,55 @@ class ID_Map(bpy.types.PropertyGroup):
 
         self.groups.remove(idx)
         self.active_index = len(self.groups) - 1
+        self.touch()
 
 
 class ID_UL_IDGroupsList(bpy.types.UIList):
 
-    def draw_item(self, context, layout, data, item, icon, active_data, active_props):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_props, index=0):
         if self.layout_type in {"DEFAULT", "COMPACT"}:
-            layout.prop(item, "name", text="", emboss=False, icon_value=icon)
+            obj = context.object
+            if self.layout_type == "COMPACT" or obj is None or obj.data != data.id_data:
+                layout.prop(item, "name", text="", emboss=False, icon_value=icon)
+                return
+
+            # only reads the cached statistics, they are computed outside of drawing
+            stats = get_group_stats(obj)
+            split = layout.split(factor=0.5)
+            split.prop(item, "name", text="", emboss=False, icon_value=icon)
+
+            if stats is not None and index < stats.count:
+                row = split.row()
+                row.alignment = "RIGHT"
+                row.label(text="%d" % stats.faces[index], icon="FACESEL")
+                row.label(text="%.3g" % stats.area[index], icon="MESH_PLANE")
+                row.label(text="%.1f%%" % (stats.uv_area[index] * 100), icon="UV")
         elif self.layout_type == "GRID":
             layout.alignment = "CENTER"
             layout.label(text="", icon_value=icon)
 
+    def filter_items(self, context, data, propname):
+        """Filters the groups by name and sorts them alphabetically if requested. The result only depends on the group
+        names and the filter settings, so it's cached until either changes instead of being redone on every redraw.
+        Inverting and reversing are applied by Blender afterwards."""
+        groups = getattr(data, propname)
+        key = data.as_pointer()
+        signature = (data.revision, len(groups), self.filter_name, self.use_filter_sort_alpha)
+
+        entry = group_list_filters.get(key)
+        if entry is None or entry[0] != signature:
+            helpers = bpy.types.UI_UL_list
+            flags = []
+            order = []
+
+            if self.filter_name:
+                flags = helpers.filter_items_by_name(self.filter_name, self.bitflag_filter_item, groups, "name")
+            if self.use_filter_sort_alpha:
+                order = helpers.sort_items_by_name(groups, "name")
+
+            entry = group_list_filters[key] = (signature, flags, order)
+        return entry[1], entry[2]
+
 
 def register():
     bpy.types.Mesh.id_map = bpy.props.PointerProperty(name="ID Map", type=ID_Map)
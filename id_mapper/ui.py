@@ -1,8 +1,14 @@
 import bpy
-from .op_assign import ID_AssignGroup, ID_AssignActiveGroup
+from .op_assign import ID_AssignActiveGroup, ID_SearchAssignGroup
+from .op_bake import ID_BakeIDMap
 from .op_create import ID_CreateGroup
+from .op_export import ID_ExportIDData
+from .op_flood_fill import ID_FloodFillGroup
+from .op_generate import ID_GenerateGroups
+from .op_material_slots import ID_GroupsToMaterialSlots, ID_MaterialSlotsToGroups
 from .op_remove import ID_RemoveGroup
 from .op_select import ID_SelectByActiveGroup
+from .op_split import ID_SplitByGroups
 from .types import ID_UL_IDGroupsList
 from .utils import check_selection_mode
 
@@ -40,9 +46,21 @@ class DATA_PT_idmap_groups(bpy.types.Panel):
 
         sub = row.row(align=True)
         sub.operator_context = "EXEC_DEFAULT"
-        # sub.operator(ID_SelectByActiveGroup.bl_idname, text="Select")
-        sub.label(text="Select")
-        sub.label(text="Deselect")
+        op = sub.operator(ID_SelectByActiveGroup.bl_idname, text="Select")
+        op.action = "SELECT"
+        op.extend = True
+        op = sub.operator(ID_SelectByActiveGroup.bl_idname, text="Deselect")
+        op.action = "DESELECT"
+
+        row = layout.row(align=True)
+        row.operator(ID_GenerateGroups.bl_idname, text="Generate", icon="MOD_EXPLODE")
+        row.operator(ID_BakeIDMap.bl_idname, text="Bake", icon="RENDER_STILL")
+        row.operator(ID_ExportIDData.bl_idname, text="Export", icon="EXPORT")
+        row.operator(ID_SplitByGroups.bl_idname, text="Split", icon="MOD_EDGESPLIT")
+
+        row = layout.row(align=True)
+        row.operator(ID_GroupsToMaterialSlots.bl_idname, text="To Material Slots", icon="MATERIAL")
+        row.operator(ID_MaterialSlotsToGroups.bl_idname, text="From Material Slots", icon="MATERIAL")
 
 
 class VIEW3D_MT_idmap_menu(bpy.types.Menu):
@@ -51,22 +69,20 @@ class VIEW3D_MT_idmap_menu(bpy.types.Menu):
 
     def draw(self, context):
         layout = self.layout
-        active = context.object
-        groups = active.data.id_map.groups
+        groups = context.object.data.id_map.groups
 
         layout.operator_context = "INVOKE_REGION_WIN"
 
         op = layout.operator(ID_CreateGroup.bl_idname, text="New Group")
         op.assign_selected = True
+        layout.operator(ID_GenerateGroups.bl_idname, text="Generate Groups")
+        layout.operator(ID_FloodFillGroup.bl_idname, text="Fill Connected with Active Group")
+        layout.operator(ID_SplitByGroups.bl_idname, text="Split by Groups")
 
         if len(groups) > 0:
             layout.separator()
-            layout.label(text="Assign Existing Groups")
-            col = layout.column()
-            col.operator_context = "EXEC_DEFAULT"
-            for group in groups:
-                op = col.operator(ID_AssignGroup.bl_idname, text=group.name)
-                op.group_name = group.name
+            layout.operator(ID_SearchAssignGroup.bl_idname, text="Assign Existing Group...", icon="VIEWZOOM")
+            layout.operator(ID_SelectByActiveGroup.bl_idname, text="Select Groups...")
 
 
 def edit_faces_menu(self, context):
@@ -81,10 +97,17 @@ def edit_faces_context_menu(self, context):
         layout.menu(VIEW3D_MT_idmap_menu.__name__)
 
 
+def export_menu(self, context):
+    layout: bpy.types.UILayout = self.layout
+    layout.operator(ID_ExportIDData.bl_idname, text="ID Map Data (.idmap)")
+
+
 def register():
     bpy.types.VIEW3D_MT_edit_mesh_faces.append(edit_faces_menu)
     bpy.types.VIEW3D_MT_edit_mesh_context_menu.append(edit_faces_context_menu)
+    bpy.types.TOPBAR_MT_file_export.append(export_menu)
 
 def unregister():
     bpy.types.VIEW3D_MT_edit_mesh_faces.remove(edit_faces_menu)
     bpy.types.VIEW3D_MT_edit_mesh_context_menu.remove(edit_faces_context_menu)
+    bpy.types.TOPBAR_MT_file_export.remove(export_menu)
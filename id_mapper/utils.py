@@ -1,5 +1,15 @@
 import bpy
-from mathutils import Color
+import bmesh
+import numpy as np
+
+# maximum per-channel difference for two ID colors to be considered equal, vertex colors are stored as bytes so an
+# exact float comparison can't be relied upon
+COLOR_TOLERANCE = 2.0 / 255.0
+
+# face attribute holding the ID group index of each face (offset by one so that the default of 0 means unassigned),
+# this is the source of truth for group membership while the "ID" color layer is derived from it for display
+INDEX_ATTRIBUTE = "ID Index"
+FACE_DOMAIN = "FACE" if bpy.app.version >= (3, 0, 0) else "POLYGON"
 
 
 def set_active(obj=None):
@@ -12,111 +22,389 @@ def check_selection_mode(vert=True, edge=False, face=False):
     return bpy.context.mode == "EDIT_MESH" and tuple(bpy.context.scene.tool_settings.mesh_select_mode) == (vert, edge, face)
 
 
-def get_selected_faces(context, indexes=False):
-    obj = context.object
+def get_mesh_objects(context):
+    """Returns the mesh objects to operate on: every mesh in edit-mode when editing, otherwise the selected meshes.
+    Objects sharing the same mesh data are only returned once."""
+    if context.mode == "EDIT_MESH":
+        objects = context.objects_in_mode_unique_data
+    else:
+        objects = context.selected_objects
+
+    output = {}
+    for obj in objects:
+        if obj.type == "MESH" and obj.data not in output:
+            output[obj.data] = obj
+    return list(output.values())
+
 
-    if obj == None or obj.type != "MESH":
-        return []
+def has_selected_faces(context):
+    """Returns true if any mesh in edit-mode has selected faces. Only looks at the selection counters kept by the
+    edit-mesh, so it is cheap enough to be used in poll functions."""
+    if context.mode != "EDIT_MESH":
+        return False
+    return any(obj.type == "MESH" and obj.data.total_face_sel > 0 for obj in context.objects_in_mode)
 
+
+def get_vertex_color(mesh, vertid):
+    for loop in mesh.loops:
+        if loop.vertex_index == vertid:
+            return mesh.vertex_colors[0].data[loop.index].color
+    return (0.0, 0.0, 0.0)
+
+
+def sync_from_editmode(obj):
+    """Flushes any pending edit-mode changes into the object's mesh data so it can be read in bulk."""
+    if obj.mode == "EDIT":
+        obj.update_from_editmode()
+
+
+def sync_to_editmode(obj):
+    """Refreshes the edit-mode mesh after its elements were written through the BMesh (or tags the mesh for redraw
+    outside of edit mode)."""
     mesh = obj.data
-    obj.update_from_editmode()  # Loads edit-mode data into object data
-    return [(p.index if indexes else p) for p in mesh.polygons if p.select]
 
+    if obj.mode == "EDIT":
+        bmesh.update_edit_mesh(mesh)
+    else:
+        mesh.update()
+
+
+def get_edit_bmesh(mesh):
+    """Returns the edit-mode BMesh of the mesh with its lookup tables and element indices up to date, so that its
+    elements line up with the arrays read from the mesh data after sync_from_editmode."""
+    bm = bmesh.from_edit_mesh(mesh)
+    for elements in (bm.verts, bm.edges, bm.faces):
+        elements.ensure_lookup_table()
+        elements.index_update()
+    return bm
+
+
+def read_edit_mesh(mesh, read):
+    """Returns the result of calling read with a temporary copy of the edit-mode mesh. The layers of a mesh in
+    edit-mode can't be read in bulk, and converting the edit-mesh to a copy happens in C, which is much faster than
+    reading the layers element by element through the BMesh. The copy is removed again afterwards."""
+    copy = bpy.data.meshes.new(mesh.name)
+    try:
+        bmesh.from_edit_mesh(mesh).to_mesh(copy)
+        return read(copy)
+    finally:
+        bpy.data.meshes.remove(copy)
+
+
+def set_edit_values(elements, key, values, current):
+    """Writes the values to a sequence of edit-mode BMesh elements, either to the attribute with the given name or to
+    the given custom data layer. Only the elements whose value differs from the current one are touched, so the cost
+    grows with the size of the change rather than with the size of the mesh. Returns the indices of those elements."""
+    changed = np.flatnonzero(values != current)
+
+    if isinstance(key, str):
+        for index, value in zip(changed.tolist(), values[changed].tolist()):
+            setattr(elements[index], key, value)
+    else:
+        for index, value in zip(changed.tolist(), values[changed].tolist()):
+            elements[index][key] = value
 
-def select_faces_by_color(context, color):
-    """Will find the faces of the active mesh that have the assigned color and select them."""
+    return changed
 
-    if context.object == None or context.mode != "EDIT_MESH":
-        return
 
-    context.tool_settings.mesh_select_mode = (False, False, True)
-    bpy.ops.mesh.select_all(action="DESELECT")
+def read_selection(elements):
+    """Returns a boolean array containing the selection state of each vertex, edge or face of a mesh."""
+    selection = np.zeros(len(elements), dtype=bool)
+    elements.foreach_get("select", selection)
+    return selection
 
-    mesh = context.object.data
 
-    if "ID" not in mesh.vertex_colors:
-        mesh.vertex_colors.new(name="ID")
-    colormap = mesh.vertex_colors["ID"]
+def get_face_selection(mesh):
+    """Returns a boolean array containing the selection state of each face of the mesh."""
+    return read_selection(mesh.polygons)
 
-    print(colormap.data)
 
-    for poly in mesh.polygons:
-        lix = poly.loop_indices[0]
-        # Only look at first vertex as all should have same color
-        if (0 <= lix < len(colormap.data)) and colormap.data[lix].color == Color(color[0:3]):
-            poly.select = True
-            print("face selected!")
+def read_material_indices(mesh):
+    """Returns the material slot index of each face of the mesh."""
+    indices = np.zeros(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", indices)
+    return indices
 
 
-def get_vertex_color(mesh, vertid):
-    for loop in mesh.loops:
-        if loop.vertex_index == vertid:
-            return mesh.vertex_colors[0].data[loop.index].color
-    return (0.0, 0.0, 0.0)
+def write_material_indices(mesh, indices, current=None):
+    """Stores the material slot index of each face. In edit-mode only the faces whose index differs from `current`
+    (the indices read from the mesh data unless given) are written."""
+    indices = np.asarray(indices, dtype=np.int32)
 
+    if mesh.is_editmode:
+        current = read_material_indices(mesh) if current is None else current
+        set_edit_values(get_edit_bmesh(mesh).faces, "material_index", indices, current)
+    else:
+        mesh.polygons.foreach_set("material_index", indices)
+
+
+def get_loop_faces(mesh):
+    """Returns an array that maps each loop (face corner) of the mesh to the index of the face that owns it."""
+    count = len(mesh.polygons)
+    starts = np.zeros(count, dtype=np.int32)
+    totals = np.zeros(count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", starts)
+    mesh.polygons.foreach_get("loop_total", totals)
+
+    order = np.argsort(starts, kind="stable")
+    return np.repeat(order, totals[order])
+
+
+def set_edit_selection(mesh, vert_mask, edge_mask, face_mask):
+    """Applies the selection masks to the edit-mode BMesh of the mesh, only touching the elements whose selection
+    changes so that the select history and the active face are kept."""
+    bm = get_edit_bmesh(mesh)
+    verts, edges, faces = bm.verts, bm.edges, bm.faces
+
+    changed_faces = np.flatnonzero(face_mask != read_selection(mesh.polygons)).tolist()
+    changed_edges = np.flatnonzero(edge_mask != read_selection(mesh.edges)).tolist()
+    changed_verts = np.flatnonzero(vert_mask != read_selection(mesh.vertices)).tolist()
+
+    deselected_faces = [faces[i] for i in changed_faces if not face_mask[i]]
+    deselected_edges = [edges[i] for i in changed_edges if not edge_mask[i]]
+
+    for element in deselected_faces + deselected_edges:
+        element.select = False
+    for i in changed_verts:
+        if not vert_mask[i]:
+            verts[i].select = False
+    for i in changed_faces:
+        if face_mask[i]:
+            faces[i].select = True
+
+    # deselecting a face or edge can also deselect the elements it shares with ones that stay selected, depending on
+    # the select mode, so those are selected again
+    for face in deselected_faces:
+        for edge in face.edges:
+            if edge_mask[edge.index]:
+                edge.select = True
+    for element in deselected_faces + deselected_edges:
+        for vert in element.verts:
+            if vert_mask[vert.index]:
+                vert.select = True
+
+    bm.select_history.validate()
+
+
+def set_face_selection(mesh, face_mask):
+    """Selects exactly the masked faces (hidden faces are skipped) and flushes the selection down to the edges and
+    vertices they use. The mesh data must be in sync with edit-mode (see sync_from_editmode), in which case the
+    selection is written to the edit-mode mesh."""
+    hidden = np.zeros(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("hide", hidden)
+    face_mask = face_mask & ~hidden
+
+    loop_mask = face_mask[get_loop_faces(mesh)]
+    loop_verts = np.zeros(len(mesh.loops), dtype=np.int32)
+    loop_edges = np.zeros(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+
+    vert_mask = np.zeros(len(mesh.vertices), dtype=bool)
+    vert_mask[loop_verts[loop_mask]] = True
+    edge_mask = np.zeros(len(mesh.edges), dtype=bool)
+    edge_mask[loop_edges[loop_mask]] = True
+
+    if mesh.is_editmode:
+        set_edit_selection(mesh, vert_mask, edge_mask, face_mask)
+    else:
+        mesh.vertices.foreach_set("select", vert_mask)
+        mesh.edges.foreach_set("select", edge_mask)
+        mesh.polygons.foreach_set("select", face_mask)
 
-def paint_selected_faces(context, color):
-    """Paints the selected faces with the given color."""
-    mode = context.mode
-    obj = context.object
-    mesh = obj.data
 
-    # use active color map, create one if none available
+def ensure_id_layers(mesh):
+    """Creates the ID index attribute and the "ID" display color layer of the mesh if they don't exist yet. Returns
+    True if existing "ID" colors from before the index attribute was introduced need to be migrated."""
+    legacy = False
+
+    if mesh.attributes.get(INDEX_ATTRIBUTE) is None:
+        legacy = "ID" in mesh.vertex_colors and len(mesh.id_map.groups) > 0
+        mesh.attributes.new(INDEX_ATTRIBUTE, "INT", FACE_DOMAIN)
+
     if "ID" not in mesh.vertex_colors:
-        id_map = mesh.vertex_colors.new(name="ID")
-        mesh.vertex_colors.active = id_map
+        mesh.vertex_colors.active = mesh.vertex_colors.new(name="ID")
+
+    return legacy
+
+
+def prepare_id_mesh(obj):
+    """Makes sure the ID layers exist and that the mesh data is in sync with edit-mode so it can be read and written
+    in bulk. Call sync_to_editmode once done writing."""
+    mesh = obj.data
+    legacy = ensure_id_layers(mesh)
+    sync_from_editmode(obj)
+
+    if legacy:
+        write_face_ids(mesh, get_face_ids_from_colors(mesh))
+
+
+def read_face_ids(mesh):
+    """Returns the ID group index of each face, -1 marks faces that aren't assigned to any group."""
+    if mesh.is_editmode:
+        return read_edit_mesh(mesh, read_face_ids)
+
+    ids = np.zeros(len(mesh.polygons), dtype=np.int32)
+    mesh.attributes[INDEX_ATTRIBUTE].data.foreach_get("value", ids)
+    return ids - 1
+
+
+def write_face_ids(mesh, ids):
+    """Stores the ID group index of each face and refreshes the "ID" display colors from the group palette. In
+    edit-mode only the faces whose group changes are written."""
+    ids = np.asarray(ids, dtype=np.int32)
+    mesh.id_map.touch_faces()
+
+    if mesh.is_editmode:
+        bm = get_edit_bmesh(mesh)
+        layer = bm.faces.layers.int[INDEX_ATTRIBUTE]
+        faces = set_edit_values(bm.faces, layer, ids + 1, read_face_ids(mesh) + 1)
+        update_id_colors(mesh, ids, faces)
+    else:
+        mesh.attributes[INDEX_ATTRIBUTE].data.foreach_set("value", ids + 1)
+        update_id_colors(mesh, ids)
+
+
+def get_palette(mesh):
+    """Returns the colors of the mesh's ID groups as an array with an extra black row at the end, so that indexing it
+    with -1 yields the color of unassigned faces."""
+    groups = mesh.id_map.groups
+    palette = np.zeros((len(groups) + 1) * 4, dtype=np.float32)
+    groups.foreach_get("color", palette[:-4])
+    palette = palette.reshape(-1, 4)
+    palette[-1] = (0, 0, 0, 1)
+    return palette
+
+
+def update_id_colors(mesh, ids, faces=None):
+    """Derives the "ID" display colors of the loops from the face ID group indices, either of every face or only of the
+    given faces of the edit-mode mesh. The edit-mesh can only be written element by element, so in edit-mode this costs
+    a Python call per loop of the given faces (every face if none are given), which is why write_face_ids only passes
+    the faces whose group changed."""
+    palette = get_palette(mesh)
+    ids = np.where(ids < len(palette) - 1, ids, -1)
+
+    if mesh.is_editmode:
+        bm = get_edit_bmesh(mesh)
+        layer = bm.loops.layers.color["ID"]
+        faces = np.arange(len(bm.faces)) if faces is None else faces
+        for index, color in zip(faces.tolist(), palette[ids[faces]].tolist()):
+            for loop in bm.faces[index].loops:
+                loop[layer] = color
+        return
+
+    colors = palette[ids][get_loop_faces(mesh)]
+    mesh.vertex_colors["ID"].data.foreach_set("color", colors.ravel())
+
+
+def read_face_colors(mesh):
+    """Returns the "ID" color of the first loop of each face as an array of RGB rows."""
+    starts = np.zeros(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", starts)
+
+    colors = np.empty(len(mesh.loops) * 4, dtype=np.float32)
+    mesh.vertex_colors["ID"].data.foreach_get("color", colors)
+    return colors.reshape(-1, 4)[starts, :3]
+
+
+def get_face_ids_from_colors(mesh, tolerance=COLOR_TOLERANCE):
+    """Recovers the ID group index of each face by matching the "ID" colors against the group colors. Used to migrate
+    meshes that were mapped before the index attribute existed."""
+    if mesh.is_editmode:
+        face_colors = read_edit_mesh(mesh, read_face_colors)
     else:
-        id_map = mesh.vertex_colors["ID"]
+        face_colors = read_face_colors(mesh)
 
-    bpy.ops.object.mode_set(mode="VERTEX_PAINT")
+    ids = np.full(len(mesh.polygons), -1, dtype=np.int32)
+    for index, color in enumerate(get_palette(mesh)[:-1]):
+        ids[(np.abs(face_colors - color[:3]) <= tolerance).all(axis=1)] = index
+    return ids
 
-    prev_masking = mesh.use_paint_mask
-    prev_color_map = mesh.vertex_colors.active
-    prev_color = bpy.data.brushes["Draw"].color
 
-    mesh.use_paint_mask = True
-    mesh.vertex_colors.active = id_map
-    bpy.data.brushes["Draw"].color = color[:3]
-    bpy.ops.paint.vertex_color_set()
+def select_faces_by_groups(context, names, action="SELECT", extend=False):
+    """Changes the face selection of every mesh in edit-mode based on the faces assigned to the ID groups with the
+    given names.
 
-    mesh.vertex_colors.active = prev_color_map
-    bpy.data.brushes["Draw"].color = prev_color
+    SELECT:   Selects the matching faces
+    DESELECT: Deselects the matching faces
+    INVERT:   Selects all faces that don't match
+    """
+    if context.mode != "EDIT_MESH":
+        return
+
+    context.tool_settings.mesh_select_mode = (False, False, True)
 
-    mesh.use_paint_mask = prev_masking
+    for obj in get_mesh_objects(context):
+        mesh = obj.data
+        indices = [i for i in (mesh.id_map.get_group_index(name) for name in names) if i >= 0]
 
-    if mode != "VERTEX_PAINT":
-        if mode == "EDIT_MESH":
-            bpy.ops.object.mode_set(mode="EDIT")
+        if len(indices) > 0:
+            prepare_id_mesh(obj)
+            matches = np.isin(read_face_ids(mesh), np.asarray(indices, dtype=np.int32))
         else:
-            bpy.ops.object.mode_set(mode=mode)
+            sync_from_editmode(obj)
+            matches = np.zeros(len(mesh.polygons), dtype=bool)
 
+        selection = get_face_selection(mesh)
 
-def assign_material_to_selection(context, mat, assign_to_faces=False, select_all=False):
-    """Appends the material the mesh objects in the selection."""
-    active = context.object
-    mode = context.mode
+        if action == "DESELECT":
+            selection &= ~matches
+        else:
+            target = ~matches if action == "INVERT" else matches
+            selection = (selection | target) if extend else target
+
+        set_face_selection(mesh, selection)
+        sync_to_editmode(obj)
+
+
+def assign_selected_faces(context, name, color=None, mirror=None):
+    """Assigns the selected faces of every mesh in edit-mode to the ID group with the given name, the group is created
+    (with the given color) on meshes that don't have it yet. Passing None as the name unassigns the faces instead.
 
-    for obj in context.selected_objects:
-        if obj.type != "MESH":
+    When a mirror.FaceMirror is given, the faces mirroring the selection are assigned in the same pass, to the group
+    with the flipped side name if the mirror uses names."""
+    for obj in get_mesh_objects(context):
+        mesh = obj.data
+
+        if obj.mode == "EDIT" and mesh.total_face_sel == 0:
             continue
 
-        set_active(obj)
+        index = mirror_index = -1
+        if name is not None:
+            group = mesh.id_map.find_or_create_group(name, color)
+            index = mirror_index = mesh.id_map.get_group_index(group.name)
 
-        if mode != "EDIT_MESH":
-            bpy.ops.object.mode_set(mode="EDIT")
+            if mirror is not None and mirror.get_group_name(group.name) != group.name:
+                mirror_group = mesh.id_map.find_or_create_group(mirror.get_group_name(group.name))
+                mirror_index = mesh.id_map.get_group_index(mirror_group.name)
 
-        if mat.name not in obj.data.materials:
-            obj.data.materials.append(mat)
-            obj.active_material_index = len(obj.data.materials)-1
-        else:
-            obj.active_material_index = [*obj.data.materials].index(mat)
+        prepare_id_mesh(obj)
+
+        ids = read_face_ids(mesh)
+        selection = get_face_selection(mesh)
+        if mirror is not None:
+            ids[mirror.get_mirrored_faces(mesh, selection)] = mirror_index
+        ids[selection] = index
+        write_face_ids(mesh, ids)
+
+        sync_to_editmode(obj)
+
+
+def assign_material_to_selection(context, mat, assign_to_faces=False, select_all=False):
+    """Appends the material to the mesh objects in the selection and optionally assigns it to their (selected) faces."""
+    for obj in get_mesh_objects(context):
+        mesh = obj.data
+
+        if mat.name not in mesh.materials:
+            mesh.materials.append(mat)
+        obj.active_material_index = [*mesh.materials].index(mat)
 
         if assign_to_faces:
-            if select_all:
-                bpy.ops.mesh.select_all(action="SELECT")
-            bpy.ops.object.material_slot_assign()
+            sync_from_editmode(obj)
 
-        if mode != "EDIT_MESH":
-            bpy.ops.object.mode_set(mode=mode)
+            indices = read_material_indices(mesh)
+            current = indices.copy()
+            indices[slice(None) if select_all else get_face_selection(mesh)] = obj.active_material_index
+            write_material_indices(mesh, indices, current)
 
-    set_active(active)
+            sync_to_editmode(obj)
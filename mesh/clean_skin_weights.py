@@ -0,0 +1,101 @@
+import bpy
+import numpy as np
+from .weights import (read_vertex_weights, pad_weights, limit_weights, normalize_weights, quantize_weights,
+                      get_deform_groups, write_weight_changes)
+
+
+def clean_skin_weights(obj, limit=4, bits=8, normalize=True, only_deform=True):
+    """Limits the number of groups each vertex of the object is weighted to, then normalizes and quantizes the weights
+    like a game engine would when importing them. Returns the number of vertices whose weights changed."""
+    mesh = obj.data
+    verts, groups, weights = read_vertex_weights(mesh)
+
+    valid = groups < len(obj.vertex_groups)
+    groups, weights = pad_weights(verts[valid], groups[valid], weights[valid], len(mesh.vertices))
+
+    # only the weights of deforming bones are cleaned up, the rest (masks, helpers, ...) is left as it is
+    mask = groups >= 0
+    deform_groups = get_deform_groups(obj) if only_deform else None
+    if deform_groups is not None:
+        mask &= deform_groups[np.maximum(groups, 0)]
+
+    new_weights = limit_weights(weights, mask, limit) if limit > 0 else weights
+    if normalize:
+        new_weights = normalize_weights(new_weights, mask)
+    if bits > 0:
+        new_weights = quantize_weights(new_weights, mask, bits, keep_sum=normalize)
+
+    return write_weight_changes(obj, groups, weights, new_weights)
+
+
+class CleanSkinWeights(bpy.types.Operator):
+    """Limits, normalizes and quantizes the vertex weights of the selected meshes for use in a game engine."""
+    bl_idname = "catalyst.clean_skin_weights"
+    bl_label = "Clean Skin Weights"
+    bl_options = {"UNDO", "REGISTER"}
+
+    limit: bpy.props.IntProperty(
+        name="Limit",
+        description="Maximum number of groups a vertex can be weighted to, 0 disables the limit",
+        min=0,
+        max=32,
+        default=4,
+    )
+
+    bits: bpy.props.IntProperty(
+        name="Bits",
+        description="Precision the weights are quantized to, 0 disables quantizing",
+        min=0,
+        max=16,
+        default=8,
+    )
+
+    normalize: bpy.props.BoolProperty(
+        name="Normalize",
+        description="Scales the weights of each vertex so they sum up to 1",
+        default=True,
+    )
+
+    only_deform: bpy.props.BoolProperty(
+        name="Only Deform Groups",
+        description="Leaves the groups of non deforming bones of the armature alone",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and context.object.type == "MESH"
+
+    def execute(self, context):
+        objects = {obj for obj in context.selected_objects if obj.type == "MESH"}
+        objects.add(context.object)
+
+        # weights can only be edited outside of edit mode
+        mode = context.object.mode
+        if mode == "EDIT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+
+        changed = 0
+        for obj in objects:
+            if len(obj.vertex_groups) > 0:
+                changed += clean_skin_weights(obj, self.limit, self.bits, self.normalize, self.only_deform)
+
+        if mode == "EDIT":
+            bpy.ops.object.mode_set(mode="EDIT")
+
+        self.report({"INFO"}, "Changed the weights of %d vertices on %d objects" % (changed, len(objects)))
+
+        return {"FINISHED"}
+
+
+def add_op_to_menu(self, context):
+    layout: bpy.types.UILayout = self.layout
+    layout.operator(CleanSkinWeights.bl_idname)
+
+
+def register():
+    bpy.types.MESH_MT_vertex_group_context_menu.append(add_op_to_menu)
+
+
+def unregister():
+    bpy.types.MESH_MT_vertex_group_context_menu.remove(add_op_to_menu)
@@ -1,5 +1,53 @@
 import bpy
-import bmesh
+import numpy as np
+from mathutils import Matrix
+from .extract import MeshSource, read_array, extract_mesh, copy_object_data
+
+
+def copy_selection(obj: bpy.types.Object):
+    """Creates a new object holding a copy of the selected vertices, edges and faces of the mesh object, with all of
+    their data layers, and returns it. The object has to be synced with edit-mode beforehand."""
+    mesh: bpy.types.Mesh = obj.data
+
+    faces = np.flatnonzero(read_array(mesh.polygons, "select", len(mesh.polygons), dtype=bool))
+    edges = np.flatnonzero(read_array(mesh.edges, "select", len(mesh.edges), dtype=bool))
+    verts = np.flatnonzero(read_array(mesh.vertices, "select", len(mesh.vertices), dtype=bool))
+
+    source = MeshSource(mesh)
+    new_data, verts = extract_mesh(source, obj.name + " Data", faces, edges, verts)
+    new_obj = bpy.data.objects.new(obj.name, new_data)
+    copy_object_data(obj, new_obj, source, verts)
+
+    return new_obj
+
+
+def merge_objects(context: bpy.types.Context, objects):
+    """Joins the mesh objects into the first one with their transforms applied, which has to be done outside of
+    edit-mode. Returns the merged object."""
+    for obj in objects:
+        matrix = obj.matrix_world.copy()
+        obj.parent = None
+        obj.data.transform(matrix, shape_keys=True)
+        obj.matrix_world = Matrix.Identity(4)
+
+    target = objects[0]
+    if len(objects) == 1:
+        return target
+
+    override = {
+        "object": target,
+        "active_object": target,
+        "selected_objects": objects,
+        "selected_editable_objects": objects,
+    }
+    if hasattr(context, "temp_override"):
+        with context.temp_override(**override):
+            bpy.ops.object.join()
+    else:
+        bpy.ops.object.join(override)
+
+    return target
+
 
 class CopyAndSeparate(bpy.types.Operator):
     """Macro that extracts a copy of the current selection to a new mesh object."""
@@ -7,42 +55,48 @@ class CopyAndSeparate(bpy.types.Operator):
     bl_label = "Copy + Separate"
     bl_options = {"REGISTER", "UNDO"}
 
+    merge: bpy.props.BoolProperty(
+        name="Merge",
+        description="Merges the copies of all objects being edited into a single object with their transforms applied",
+        default=False,
+    )
+
     @classmethod
     def poll(cls, context: bpy.types.Context):
         return context.mode == "EDIT_MESH" and context.active_object != None
 
     def execute(self, context: bpy.types.Context):
-        obj: bpy.types.Object = context.active_object
-        bm: bmesh.types.BMesh = bmesh.from_edit_mesh(obj.data)
-        bm_new: bmesh.types.BMesh = bmesh.new()
+        active: bpy.types.Object = context.active_object
+        copies = []
 
-        name = obj.name
+        # copy every object being edited first, so that edit-mode only has to be left and entered once
+        for obj in context.objects_in_mode:
+            if obj.type != "MESH":
+                continue
 
-        onm = {}  # old index to new vert map
-        for v in bm.verts:
-            if v.select:
-                nv = bm_new.verts.new(v.co)
-                onm[v.index] = nv
+            obj.update_from_editmode()
+            if obj.data.total_vert_sel == 0:
+                continue
 
-        for e in bm.edges:
-            if e.select:
-                everts = [onm[v.index] for v in e.verts]
-                bm_new.edges.new(everts)
+            new_obj = copy_selection(obj)
+            if obj == active:
+                copies.insert(0, new_obj)
+            else:
+                copies.append(new_obj)
 
-        for f in bm.faces:
-            if f.select:
-                fverts = [onm[v.index] for v in f.verts]
-                bm_new.faces.new(fverts)
-
-        new_data: bpy.types.Mesh = bpy.data.meshes.new(name + " Data")
-        bm_new.to_mesh(new_data)
-        new_obj: bpy.types.Object = bpy.data.objects.new(name, new_data)
-        context.scene.collection.objects.link(new_obj)
+        if len(copies) == 0:
+            self.report({"WARNING"}, "Nothing is selected")
+            return {"CANCELLED"}
 
         bpy.ops.object.mode_set(mode="OBJECT")
+
+        if self.merge:
+            copies = [merge_objects(context, copies)]
+
         bpy.ops.object.select_all(action="DESELECT")
-        new_obj.select_set(True)
-        context.view_layer.objects.active = new_obj
+        for new_obj in copies:
+            new_obj.select_set(True)
+        context.view_layer.objects.active = copies[0]
         bpy.ops.object.mode_set(mode="EDIT")
 
         return {"FINISHED"}
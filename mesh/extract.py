@@ -0,0 +1,261 @@
+import bpy
+import bmesh
+import numpy as np
+from .weights import copy_vertex_weights
+
+# value property and number of components of each attribute data type
+ATTRIBUTE_VALUES = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+}
+
+
+def get_element_flags(struct, names):
+    """Returns the (name, dtype) of the properties of a mesh element type that exist in this version of Blender.
+    Some of them (creases, bevel weights, ...) became generic attributes in later versions, which are copied as such."""
+    properties = struct.bl_rna.properties
+    return [(name, bool if properties[name].type == "BOOLEAN" else np.float32) for name in names if name in properties]
+
+
+VERTEX_FLAGS = get_element_flags(bpy.types.MeshVertex, ("select", "hide", "bevel_weight"))
+EDGE_FLAGS = get_element_flags(bpy.types.MeshEdge, (
+    "select", "hide", "use_seam", "use_edge_sharp", "use_freestyle_mark", "crease", "bevel_weight"))
+FACE_FLAGS = get_element_flags(bpy.types.MeshPolygon, ("select", "hide", "use_smooth", "use_freestyle_mark"))
+
+
+def read_array(collection, prop, count, size=1, dtype=np.float32):
+    """Reads a property of every item of the collection into an array of shape (count, size), or (count,) if size is 1."""
+    values = np.zeros(count * size, dtype=dtype)
+    collection.foreach_get(prop, values)
+    return values if size == 1 else values.reshape(-1, size)
+
+
+def get_face_loops(starts, totals, faces):
+    """Returns the indices of the loops of the given faces, in face order."""
+    counts = totals[faces]
+    return np.repeat(starts[faces] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+
+
+def read_flags(elements, flags):
+    """Reads the given properties of every element into a list of (name, array) pairs."""
+    return [(name, read_array(elements, name, len(elements), dtype=dtype)) for name, dtype in flags]
+
+
+class MeshSource:
+    """The arrays of a mesh that extract_mesh builds new meshes from. They're read once up front, so that any number of
+    meshes can be extracted from the same source by only slicing them.
+
+    The layers of a mesh in edit-mode can't be read in bulk, so those meshes are read through a temporary copy of the
+    edit-mesh. Shape keys are read from the mesh itself, which has to be synced with update_from_editmode beforehand."""
+
+    def __init__(self, mesh):
+        self.name = mesh.name
+        self.materials = [*mesh.materials]
+
+        if not mesh.is_editmode:
+            self.read(mesh)
+        else:
+            copy = bpy.data.meshes.new(mesh.name)
+            try:
+                bmesh.from_edit_mesh(mesh).to_mesh(copy)
+                self.read(copy)
+            finally:
+                bpy.data.meshes.remove(copy)
+
+        self.shape_keys = None
+        key = mesh.shape_keys
+        if key is not None:
+            self.shape_keys = (key.use_relative, [
+                (block, read_array(block.data, "co", len(block.data), 3)) for block in key.key_blocks
+            ])
+
+    def read(self, mesh):
+        self.vert_count = len(mesh.vertices)
+        self.edge_count = len(mesh.edges)
+        self.face_count = len(mesh.polygons)
+        loop_count = len(mesh.loops)
+
+        self.starts = read_array(mesh.polygons, "loop_start", self.face_count, dtype=np.int64)
+        self.totals = read_array(mesh.polygons, "loop_total", self.face_count, dtype=np.int64)
+        self.loop_verts = read_array(mesh.loops, "vertex_index", loop_count, dtype=np.int64)
+        self.loop_edges = read_array(mesh.loops, "edge_index", loop_count, dtype=np.int64)
+        self.edge_verts = read_array(mesh.edges, "vertices", self.edge_count, 2, np.int64)
+
+        self.coords = read_array(mesh.vertices, "co", self.vert_count, 3)
+        self.material_indices = read_array(mesh.polygons, "material_index", self.face_count, dtype=np.int32)
+        self.vert_flags = read_flags(mesh.vertices, VERTEX_FLAGS)
+        self.edge_flags = read_flags(mesh.edges, EDGE_FLAGS)
+        self.face_flags = read_flags(mesh.polygons, FACE_FLAGS)
+
+        self.uv_layers = [
+            (layer.name, layer.active_render, read_array(layer.data, "uv", loop_count, 2)) for layer in mesh.uv_layers
+        ]
+        self.active_uv = mesh.uv_layers.active.name if mesh.uv_layers.active is not None else None
+
+        self.vertex_colors = [
+            (layer.name, read_array(layer.data, "color", loop_count, 4)) for layer in mesh.vertex_colors
+        ]
+        self.active_color = mesh.vertex_colors.active.name if mesh.vertex_colors.active is not None else None
+
+        self.attributes = []
+        for attr in mesh.attributes:
+            if attr.data_type not in ATTRIBUTE_VALUES or attr.name.startswith("."):
+                continue
+            prop, size, dtype = ATTRIBUTE_VALUES[attr.data_type]
+            values = read_array(attr.data, prop, len(attr.data), size, dtype)
+            self.attributes.append((attr.name, attr.data_type, attr.domain, prop, values))
+
+        self.use_auto_smooth = mesh.use_auto_smooth
+        self.auto_smooth_angle = mesh.auto_smooth_angle
+        self.custom_normals = None
+        if mesh.has_custom_normals:
+            mesh.calc_normals_split()
+            self.custom_normals = read_array(mesh.loops, "normal", loop_count, 3)
+
+
+def copy_attributes(source, dst, domains):
+    """Copies the generic attributes of the source to the destination mesh. domains maps each attribute domain to the
+    indices of the source elements making up the elements of the destination mesh in that domain. Attributes the
+    destination already has (built-in ones, UV maps, ...) are left alone."""
+    for name, data_type, domain, prop, values in source.attributes:
+        index = domains.get(domain)
+        if index is None or dst.attributes.get(name) is not None:
+            continue
+
+        new_attr = dst.attributes.new(name, data_type, domain)
+        new_attr.data.foreach_set(prop, values[index].ravel())
+
+
+def extract_mesh(source, name, faces, edges=(), verts=()):
+    """Builds a new mesh out of the given faces of the source (a MeshSource), along with the edges and vertices of those
+    faces and any additional (loose) edges and vertices given. Keeps the UV maps, vertex colors, generic attributes,
+    materials, edge and face flags and custom normals. Everything is sliced out of the arrays of the source, so the cost
+    only grows with the size of the new mesh.
+
+    Returns the new mesh along with the index of the source vertex of each of its vertices, which is what's needed to
+    carry over per vertex data that lives on the object or its shape keys (see copy_object_data)."""
+    faces = np.asarray(faces, dtype=np.int64)
+
+    loops = get_face_loops(source.starts, source.totals, faces)
+    edges = np.union1d(source.loop_edges[loops], np.asarray(edges, dtype=np.int64))
+    verts = np.union1d(source.edge_verts[edges].ravel(), np.asarray(verts, dtype=np.int64))
+
+    vert_map = np.full(source.vert_count, -1, dtype=np.int64)
+    vert_map[verts] = np.arange(len(verts))
+    edge_map = np.full(source.edge_count, -1, dtype=np.int64)
+    edge_map[edges] = np.arange(len(edges))
+
+    new_totals = source.totals[faces]
+    new_starts = np.cumsum(new_totals) - new_totals
+
+    new = bpy.data.meshes.new(name)
+
+    new.vertices.add(len(verts))
+    new.vertices.foreach_set("co", source.coords[verts].ravel())
+    for flag, values in source.vert_flags:
+        new.vertices.foreach_set(flag, values[verts])
+
+    new.edges.add(len(edges))
+    new.edges.foreach_set("vertices", vert_map[source.edge_verts[edges]].astype(np.int32).ravel())
+    for flag, values in source.edge_flags:
+        new.edges.foreach_set(flag, values[edges])
+
+    new.loops.add(len(loops))
+    new.loops.foreach_set("vertex_index", vert_map[source.loop_verts[loops]].astype(np.int32))
+    new.loops.foreach_set("edge_index", edge_map[source.loop_edges[loops]].astype(np.int32))
+
+    new.polygons.add(len(faces))
+    new.polygons.foreach_set("loop_start", new_starts.astype(np.int32))
+    new.polygons.foreach_set("loop_total", new_totals.astype(np.int32))
+    new.polygons.foreach_set("material_index", source.material_indices[faces])
+    for flag, values in source.face_flags:
+        new.polygons.foreach_set(flag, values[faces])
+
+    for material in source.materials:
+        new.materials.append(material)
+
+    for layer_name, active_render, uvs in source.uv_layers:
+        new_layer = new.uv_layers.new(name=layer_name, do_init=False)
+        new_layer.data.foreach_set("uv", uvs[loops].ravel())
+        new_layer.active_render = active_render
+    if source.active_uv is not None:
+        new.uv_layers.active = new.uv_layers[source.active_uv]
+
+    for layer_name, colors in source.vertex_colors:
+        new_layer = new.vertex_colors.new(name=layer_name, do_init=False)
+        new_layer.data.foreach_set("color", colors[loops].ravel())
+    if source.active_color is not None:
+        new.vertex_colors.active = new.vertex_colors[source.active_color]
+
+    copy_attributes(source, new, {
+        "POINT": verts,
+        "EDGE": edges,
+        "FACE": faces,
+        "POLYGON": faces,
+        "CORNER": loops,
+    })
+
+    new.update()
+
+    new.use_auto_smooth = source.use_auto_smooth
+    new.auto_smooth_angle = source.auto_smooth_angle
+    if source.custom_normals is not None:
+        new.use_auto_smooth = True
+        new.normals_split_custom_set(source.custom_normals[loops])
+
+    return new, verts
+
+
+def copy_shape_keys(source, dst_obj, verts):
+    """Copies the shape keys of the source (a MeshSource) to the destination object, where vertex i of the destination
+    corresponds to vertex verts[i] of the source."""
+    if source.shape_keys is None:
+        return
+
+    use_relative, blocks = source.shape_keys
+    for block, coords in blocks:
+        new_block = dst_obj.shape_key_add(name=block.name, from_mix=False)
+        new_block.data.foreach_set("co", coords[verts].ravel())
+
+        # the slider range limits the value, so it has to be set first
+        for prop in ("slider_max", "slider_min", "value", "interpolation", "mute", "vertex_group"):
+            setattr(new_block, prop, getattr(block, prop))
+
+    new_key = dst_obj.data.shape_keys
+    new_key.use_relative = use_relative
+    for block, _ in blocks:
+        new_key.key_blocks[block.name].relative_key = new_key.key_blocks[block.relative_key.name]
+
+
+def copy_object_data(src_obj, dst_obj, source, verts, weights=None):
+    """Gives an object holding a mesh made with extract_mesh the transform, parent, collections, material links,
+    vertex groups and shape keys of the object it was extracted from, whose mesh `source` was read from. Pass the
+    result of read_vertex_weights as `weights` when extracting several meshes from the same object."""
+    dst_obj.parent = src_obj.parent
+    dst_obj.parent_type = src_obj.parent_type
+    dst_obj.parent_bone = src_obj.parent_bone
+    dst_obj.matrix_parent_inverse = src_obj.matrix_parent_inverse.copy()
+    dst_obj.matrix_world = src_obj.matrix_world.copy()
+
+    for collection in src_obj.users_collection:
+        collection.objects.link(dst_obj)
+
+    # materials linked to the object rather than the mesh
+    for slot, new_slot in zip(src_obj.material_slots, dst_obj.material_slots):
+        if slot.link == "OBJECT":
+            new_slot.link = "OBJECT"
+            new_slot.material = slot.material
+
+    if len(src_obj.vertex_groups) > 0:
+        copy_vertex_weights(src_obj, dst_obj, verts, weights)
+        dst_obj.vertex_groups.active_index = src_obj.vertex_groups.active_index
+
+    copy_shape_keys(source, dst_obj, verts)
+    if source.shape_keys is not None:
+        dst_obj.active_shape_key_index = src_obj.active_shape_key_index
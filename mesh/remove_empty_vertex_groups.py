@@ -1,34 +1,84 @@
 import bpy
+import numpy as np
+from .weights import read_vertex_weights, remove_vertex_weights
+
+
+def remove_empty_vertex_groups(obj, threshold=0.0, strip_weights=False):
+    """Removes the vertex groups of the object that have no vertex weighted above the threshold, optionally removing
+    the assignments at or below the threshold from the remaining groups as well. Returns the number of removed groups
+    and the number of removed assignments."""
+    verts, groups, weights = read_vertex_weights(obj.data)
+
+    # ignore assignments to groups that no longer exist on this object
+    valid = groups < len(obj.vertex_groups)
+    verts, groups, weights = verts[valid], groups[valid], weights[valid]
+
+    weak = weights <= threshold
+
+    used = np.bincount(groups[~weak], minlength=len(obj.vertex_groups)) > 0
+    stripped = 0
+
+    if strip_weights:
+        strip = weak & used[groups]
+        remove_vertex_weights(obj, verts[strip], groups[strip])
+        stripped = int(strip.sum())
+
+    empty = [obj.vertex_groups[int(i)] for i in np.flatnonzero(~used)]
+    for vg in empty:
+        obj.vertex_groups.remove(vg)
+
+    return len(empty), stripped
+
 
 class RemoveEmptyVertexGroups(bpy.types.Operator):
-    """Removes all vertex groups that have no vertices assigned to them."""
+    """Removes all vertex groups of the selected meshes that have no vertices weighted to them."""
     bl_idname = "catalyst.remove_empty_vertex_groups"
     bl_label = "Remove Empty Vertex Groups"
     bl_options = {"UNDO", "REGISTER"}
 
+    threshold: bpy.props.FloatProperty(
+        name="Threshold",
+        description="Vertices weighted at or below this value don't count as being in the group",
+        min=0,
+        max=1,
+        default=0,
+    )
+
+    strip_weights: bpy.props.BoolProperty(
+        name="Strip Weak Weights",
+        description="Also removes the vertices weighted at or below the threshold from the groups that are kept",
+        default=False,
+    )
+
     @classmethod
     def poll(cls, context):
         return context.object is not None and context.object.type == "MESH"
 
     def execute(self, context):
+        objects = {obj for obj in context.selected_objects if obj.type == "MESH"}
+        objects.add(context.object)
+
+        # weights can only be edited outside of edit mode
+        mode = context.object.mode
+        if mode == "EDIT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+
+        removed_groups = 0
+        removed_weights = 0
 
-        obj: bpy.types.Object = context.object
-        mesh: bpy.types.Mesh = obj.data
+        for obj in objects:
+            if len(obj.vertex_groups) == 0:
+                continue
 
-        empty_groups = dict([(vg.index, vg) for vg in obj.vertex_groups])
+            groups, weights = remove_empty_vertex_groups(obj, self.threshold, self.strip_weights)
+            removed_groups += groups
+            removed_weights += weights
 
-        # loop through each vert and remove any groups from the "empty_groups" set if
-        # weight is greater than 0
-        # TODO: this operation is pretty slow, would be good to explore alternatives
-        for v in mesh.vertices:
-            for g in v.groups:
-                if g.weight > 0:
-                    empty_groups.pop(g.group, None)
+        if mode == "EDIT":
+            bpy.ops.object.mode_set(mode="EDIT")
 
-        # loop through the empty groups and remove them
-        for eg in empty_groups.values():
-            print("Removing vertex group: %s" % eg.name)
-            obj.vertex_groups.remove(eg)
+        self.report({"INFO"}, "Removed %d vertex groups and %d weights from %d objects" % (
+            removed_groups, removed_weights, len(objects)))
 
         return {"FINISHED"}
 
@@ -44,4 +94,4 @@ def register():
 
 
 def unregister():
-    bpy.types.MESH_MT_vertex_group_context_menu.remove(add_op_to_menu)
\ No newline at end of file
+    bpy.types.MESH_MT_vertex_group_context_menu.remove(add_op_to_menu)
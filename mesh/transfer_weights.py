@@ -0,0 +1,218 @@
+import bpy
+import numpy as np
+from mathutils.bvhtree import BVHTree
+from mathutils.kdtree import KDTree
+from .extract import read_array
+from .weights import (read_vertex_weights, write_vertex_weights, remove_vertex_weights, limit_weights,
+                      normalize_weights, quantize_weights)
+
+
+def get_world_coords(obj):
+    """Returns the world space positions of the vertices of the mesh object."""
+    mesh = obj.data
+    coords = read_array(mesh.vertices, "co", len(mesh.vertices), 3, np.float64)
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def get_dense_weights(obj):
+    """Returns the weights of the mesh object as a (vertices, groups) array, keeping only the groups that have any
+    vertex assigned to them, along with the indices of those groups."""
+    verts, groups, weights = read_vertex_weights(obj.data)
+
+    valid = groups < len(obj.vertex_groups)
+    verts, groups, weights = verts[valid], groups[valid], weights[valid]
+
+    used, columns = np.unique(groups, return_inverse=True)
+    dense = np.zeros((len(obj.data.vertices), len(used)), dtype=np.float32)
+    dense[verts, columns] = weights
+    return dense, used
+
+
+def get_barycentric(points, a, b, c):
+    """Returns the barycentric coordinates of each point on the triangle (a, b, c) at the same index."""
+    v0, v1, v2 = b - a, c - a, points - a
+    d00 = (v0 * v0).sum(axis=1)
+    d01 = (v0 * v1).sum(axis=1)
+    d11 = (v1 * v1).sum(axis=1)
+    d20 = (v2 * v0).sum(axis=1)
+    d21 = (v2 * v1).sum(axis=1)
+
+    denominator = d00 * d11 - d01 * d01
+    degenerate = np.abs(denominator) < 1e-12
+    denominator[degenerate] = 1.0
+
+    v = (d11 * d20 - d01 * d21) / denominator
+    w = (d00 * d21 - d01 * d20) / denominator
+    coords = np.stack((1.0 - v - w, v, w), axis=1)
+    coords[degenerate] = (1.0, 0.0, 0.0)
+
+    # the nearest point lies on the triangle, this only cleans up floating point error
+    coords = np.clip(coords, 0.0, 1.0)
+    return coords / coords.sum(axis=1, keepdims=True)
+
+
+class WeightSource:
+    """The weights of a source mesh object along with a search structure over its world space surface, built once
+    and used for every target."""
+
+    def __init__(self, obj, method="INTERPOLATED"):
+        self.method = method
+        self.weights, self.groups = get_dense_weights(obj)
+        self.names = [obj.vertex_groups[int(i)].name for i in self.groups]
+
+        coords = get_world_coords(obj)
+
+        if method == "NEAREST":
+            self.tree = KDTree(len(coords))
+            for index, co in enumerate(coords.tolist()):
+                self.tree.insert(co, index)
+            self.tree.balance()
+        else:
+            mesh = obj.data
+            mesh.calc_loop_triangles()
+            self.triangles = read_array(mesh.loop_triangles, "vertices", len(mesh.loop_triangles), 3, np.int64)
+            self.coords = coords
+            self.tree = BVHTree.FromPolygons(coords.tolist(), self.triangles.tolist())
+
+    def sample(self, points, max_distance=0.0):
+        """Returns the weights of the source at each point, points further than max_distance (unless 0) from the
+        source get no weights at all."""
+        limit = max_distance if max_distance > 0 else 1.0e30
+        output = np.zeros((len(points), len(self.groups)), dtype=np.float32)
+
+        if self.method == "NEAREST":
+            hits = [self.tree.find(co) for co in points.tolist()]
+            found = np.array([hit[1] is not None and hit[2] <= limit for hit in hits], dtype=bool)
+            indices = np.array([hit[1] if hit[1] is not None else 0 for hit in hits], dtype=np.int64)
+            output[found] = self.weights[indices[found]]
+            return output
+
+        hits = [self.tree.find_nearest(co, limit) for co in points.tolist()]
+        found = np.array([hit[2] is not None for hit in hits], dtype=bool)
+        if not found.any():
+            return output
+
+        locations = np.array([hit[0] for hit, ok in zip(hits, found) if ok], dtype=np.float64)
+        triangles = self.triangles[np.array([hit[2] for hit, ok in zip(hits, found) if ok], dtype=np.int64)]
+
+        corners = self.coords[triangles]
+        blend = get_barycentric(locations, corners[:, 0], corners[:, 1], corners[:, 2])
+        sampled = np.zeros((len(triangles), len(self.groups)), dtype=np.float32)
+        for corner in range(3):
+            sampled += self.weights[triangles[:, corner]] * blend[:, corner, None].astype(np.float32)
+        output[found] = sampled
+        return output
+
+
+def transfer_weights(source, obj, max_distance=0.0, limit=4, normalize=True, bits=0):
+    """Replaces the weights of the target object in every group of the source with the weights sampled from the
+    source, limiting, normalizing and quantizing them on the way. Groups the target doesn't have yet are created."""
+    weights = source.sample(get_world_coords(obj), max_distance)
+    mask = np.ones(weights.shape, dtype=bool)
+
+    if limit > 0:
+        weights = limit_weights(weights, mask, limit)
+    if normalize:
+        weights = normalize_weights(weights, mask)
+    if bits > 0:
+        weights = quantize_weights(weights, mask, bits, keep_sum=normalize)
+
+    for name in source.names:
+        if name not in obj.vertex_groups:
+            obj.vertex_groups.new(name=name)
+    group_map = np.array([obj.vertex_groups[name].index for name in source.names], dtype=np.int64)
+
+    # clear the existing assignments of the transferred groups that don't receive a weight
+    columns = np.full(len(obj.vertex_groups), -1, dtype=np.int64)
+    columns[group_map] = np.arange(len(group_map))
+
+    verts, groups, _ = read_vertex_weights(obj.data)
+    valid = groups < len(columns)
+    verts, groups = verts[valid], groups[valid]
+
+    column = columns[groups]
+    stale = column >= 0
+    stale[stale] = weights[verts[stale], column[stale]] <= 0
+    remove_vertex_weights(obj, verts[stale], groups[stale])
+
+    rows, cols = np.nonzero(weights > 0)
+    write_vertex_weights(obj, rows, group_map[cols], weights[rows, cols].astype(np.float32))
+
+
+class TransferWeights(bpy.types.Operator):
+    """Transfers the vertex weights of the active mesh to the other selected meshes."""
+    bl_idname = "catalyst.transfer_weights"
+    bl_label = "Transfer Weights from Active"
+    bl_options = {"UNDO", "REGISTER"}
+
+    method: bpy.props.EnumProperty(
+        name="Method",
+        items=[
+            ("NEAREST", "Nearest Vertex", "Copy the weights of the nearest vertex of the source"),
+            ("INTERPOLATED", "Interpolated Face", "Blend the weights of the nearest point on the surface of the source"),
+        ],
+        default="INTERPOLATED",
+    )
+
+    max_distance: bpy.props.FloatProperty(
+        name="Max Distance",
+        description="Vertices further than this from the source don't receive weights, 0 disables the limit",
+        subtype="DISTANCE",
+        min=0,
+        default=0,
+    )
+
+    limit: bpy.props.IntProperty(
+        name="Limit",
+        description="Maximum number of groups a vertex can be weighted to, 0 disables the limit",
+        min=0,
+        max=32,
+        default=4,
+    )
+
+    normalize: bpy.props.BoolProperty(
+        name="Normalize",
+        description="Scales the weights of each vertex so they sum up to 1",
+        default=True,
+    )
+
+    bits: bpy.props.IntProperty(
+        name="Bits",
+        description="Precision the weights are quantized to, 0 disables quantizing",
+        min=0,
+        max=16,
+        default=0,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return context.mode == "OBJECT" and obj is not None and obj.type == "MESH" and len(obj.vertex_groups) > 0
+
+    def execute(self, context):
+        targets = [obj for obj in context.selected_objects if obj.type == "MESH" and obj != context.object]
+        if len(targets) == 0:
+            self.report({"WARNING"}, "Select the meshes to transfer the weights to, then the source mesh")
+            return {"CANCELLED"}
+
+        source = WeightSource(context.object, self.method)
+        for obj in targets:
+            transfer_weights(source, obj, self.max_distance, self.limit, self.normalize, self.bits)
+
+        self.report({"INFO"}, "Transferred %d vertex groups to %d objects" % (len(source.groups), len(targets)))
+
+        return {"FINISHED"}
+
+
+def add_op_to_menu(self, context):
+    layout: bpy.types.UILayout = self.layout
+    layout.operator(TransferWeights.bl_idname)
+
+
+def register():
+    bpy.types.MESH_MT_vertex_group_context_menu.append(add_op_to_menu)
+
+
+def unregister():
+    bpy.types.MESH_MT_vertex_group_context_menu.remove(add_op_to_menu)
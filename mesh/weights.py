@@ -0,0 +1,157 @@
+import numpy as np
+
+
+def read_vertex_weights(mesh):
+    """Returns every vertex group assignment of the mesh as three flat arrays: the vertex index, the group index and
+    the weight of each assignment. Blender doesn't expose deform weights through foreach_get, so this is the one place
+    that walks the vertices in Python, everything else works on the returned arrays."""
+    values = np.fromiter(
+        (x for v in mesh.vertices for g in v.groups for x in (v.index, g.group, g.weight)),
+        dtype=np.float64,
+    ).reshape(-1, 3)
+
+    return values[:, 0].astype(np.int64), values[:, 1].astype(np.int64), values[:, 2].astype(np.float32)
+
+
+def write_vertex_weights(obj, verts, groups, weights):
+    """Assigns the given (vertex, group, weight) triplets to the object's vertex groups. Vertices sharing a group and
+    weight are assigned with a single call, there is no way to set deform weights in bulk. Quantized weights only take a
+    few calls per group, but weights that are all different still take about one call per assignment."""
+    if len(verts) == 0:
+        return
+
+    order = np.lexsort((weights, groups))
+    verts, groups, weights = verts[order], groups[order], weights[order]
+
+    # split the sorted assignments into runs of equal group and weight
+    breaks = np.flatnonzero((groups[1:] != groups[:-1]) | (weights[1:] != weights[:-1])) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(verts)]))
+
+    vertex_groups = obj.vertex_groups
+    for start, end in zip(starts, ends):
+        vertex_groups[int(groups[start])].add(verts[start:end].tolist(), float(weights[start]), "REPLACE")
+
+
+def copy_vertex_weights(src_obj, dst_obj, vert_indices, weights=None):
+    """Copies the vertex groups of the source object to the destination object, where vertex i of the destination
+    corresponds to vertex vert_indices[i] of the source. Pass the result of read_vertex_weights as `weights` to avoid
+    reading the weights again when copying to several objects."""
+    if weights is None:
+        weights = read_vertex_weights(src_obj.data)
+    verts, groups, values = weights
+
+    for vg in src_obj.vertex_groups:
+        if vg.name not in dst_obj.vertex_groups:
+            dst_obj.vertex_groups.new(name=vg.name)
+
+    # the destination groups were created in the same order, but it may have had groups of its own already
+    group_map = np.array([dst_obj.vertex_groups[vg.name].index for vg in src_obj.vertex_groups], dtype=np.int64)
+
+    vert_map = np.full(len(src_obj.data.vertices), -1, dtype=np.int64)
+    vert_map[vert_indices] = np.arange(len(vert_indices))
+
+    keep = vert_map[verts] >= 0
+    write_vertex_weights(dst_obj, vert_map[verts[keep]], group_map[groups[keep]], values[keep])
+
+
+def remove_vertex_weights(obj, verts, groups):
+    """Removes the given (vertex, group) assignments from the object's vertex groups, one call per group."""
+    if len(verts) == 0:
+        return
+
+    order = np.argsort(groups, kind="stable")
+    verts, groups = verts[order], groups[order]
+
+    breaks = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    for start, end in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(verts)]))):
+        obj.vertex_groups[int(groups[start])].remove(verts[start:end].tolist())
+
+
+def pad_weights(verts, groups, weights, count):
+    """Turns the flat assignments returned by read_vertex_weights into padded arrays of shape (count, N), where N is
+    the largest number of groups any vertex is in. Returns the group indices (-1 for padding) and the weights (0 for
+    padding) of each vertex."""
+    per_vertex = np.bincount(verts, minlength=count)
+    width = max(int(per_vertex.max(initial=0)), 1)
+
+    # assignments are grouped by vertex, so the slot of each one is its position within its vertex
+    order = np.argsort(verts, kind="stable")
+    starts = np.cumsum(per_vertex) - per_vertex
+    slots = np.arange(len(verts)) - starts[verts[order]]
+
+    padded_groups = np.full((count, width), -1, dtype=np.int64)
+    padded_weights = np.zeros((count, width), dtype=np.float64)
+    padded_groups[verts[order], slots] = groups[order]
+    padded_weights[verts[order], slots] = weights[order]
+    return padded_groups, padded_weights
+
+
+def limit_weights(weights, mask, limit):
+    """Zeroes all but the `limit` largest masked weights of each row. Unmasked weights are left alone."""
+    width = weights.shape[1]
+    if width <= limit:
+        return weights
+
+    order = np.argsort(-np.where(mask, weights, -1.0), axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(width), order.shape), axis=1)
+    return np.where(mask & (ranks >= limit), 0.0, weights)
+
+
+def normalize_weights(weights, mask):
+    """Scales the masked weights of each row so that they sum up to 1, rows without any masked weight are left alone."""
+    totals = np.where(mask, weights, 0.0).sum(axis=1, keepdims=True)
+    scale = np.divide(1.0, totals, out=np.ones_like(totals), where=totals > 0)
+    return np.where(mask, weights * scale, weights)
+
+
+def quantize_weights(weights, mask, bits, keep_sum=False):
+    """Rounds the masked weights to the nearest multiple of 1 / (2^bits - 1). With keep_sum, the rounding error of each
+    row is added to its largest weight so that rows summing up to 1 still do after quantizing."""
+    levels = 2 ** bits - 1
+    steps = np.where(mask, np.round(weights * levels), 0.0)
+
+    if keep_sum:
+        totals = np.where(mask, weights, 0.0).sum(axis=1)
+        rows = np.flatnonzero(totals > 0)
+        largest = np.argmax(np.where(mask, steps, -1.0), axis=1)[rows]
+        steps[rows, largest] += np.round(totals[rows] * levels) - steps[rows].sum(axis=1)
+        np.maximum(steps, 0.0, out=steps)
+
+    return np.where(mask, steps / levels, weights)
+
+
+def get_deform_groups(obj):
+    """Returns a mask of the object's vertex groups that belong to deforming bones of its armature, or None if the
+    object isn't deformed by an armature."""
+    armature = None
+    for modifier in obj.modifiers:
+        if modifier.type == "ARMATURE" and modifier.object is not None:
+            armature = modifier.object
+            break
+
+    if armature is None and obj.parent is not None and obj.parent.type == "ARMATURE":
+        armature = obj.parent
+
+    if armature is None:
+        return None
+
+    bones = armature.data.bones
+    return np.array([vg.name in bones and bones[vg.name].use_deform for vg in obj.vertex_groups], dtype=bool)
+
+
+def write_weight_changes(obj, groups, old_weights, new_weights, tolerance=1e-6):
+    """Writes back the padded weights (see pad_weights) that differ from the original ones, removing the vertices
+    whose weight dropped to 0 from the group. Returns the number of vertices that changed."""
+    changed = (groups >= 0) & (np.abs(new_weights - old_weights) > tolerance)
+    removed = changed & (new_weights <= 0)
+    replaced = changed & ~removed
+
+    rows, _ = np.nonzero(removed)
+    remove_vertex_weights(obj, rows, groups[removed])
+
+    rows, _ = np.nonzero(replaced)
+    write_vertex_weights(obj, rows, groups[replaced], new_weights[replaced].astype(np.float32))
+
+    return int(changed.any(axis=1).sum())